@@ -11,21 +11,65 @@ import pandas as pd
 import numpy as np
 import logging
 import json
-import random
+import hashlib
 from datetime import datetime
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from ortools.sat.python import cp_model
 from constraints import TimetableConstraints
 from visualize import visualize_combined_schedule
 
+try:
+    import orjson
+except ImportError:  # stdlib json is used for the schedule files instead
+    orjson = None
+
+# Background rendering for generate_timetable(async_visualizations=True); a single
+# worker because pyplot keeps global figure state and is not thread-safe
+_VIZ_POOL = ThreadPoolExecutor(max_workers=1)
+
+# Solves are reused while constraints.py (where AI-generated constraints are appended) and this
+# module (objective, scattering and anti-clustering rules) are unchanged
+CONSTRAINTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'constraints.py')
+SCHEDULER_FILE = os.path.abspath(__file__)
+FINGERPRINT_FILE = '.fingerprint'
+
 class AIScheduler:
     """
     AI-Enhanced scheduler that generates timetables using both migrated
     and AI-generated constraints, then visualizes the results.
     """
 
-    def __init__(self, course_file=None, room_file=None, courses_df=None, rooms_df=None, block_morning_slots=False, blocked_slots=None):
-        """Initialize the AI scheduler."""
+    # Map our days to visualizer expected format
+    DAY_MAPPING = {
+        'Tuesday': 'tuesday',
+        'Wednesday': 'wed',
+        'Thursday': 'thur',
+        'Friday': 'fri',
+        'Saturday': 'sat'
+    }
+
+    # Map lab time slot to session name (L1, L2, etc.)
+    LAB_SESSION_MAP = {
+        "8:00-10:00": "L1",
+        "10:10-12:10": "L2",
+        "1:20-3:20": "L3",
+        "3:30-5:30": "L4",
+        "5:40-7:40": "L5",
+        "7:50-9:50": "L6"
+    }
+
+    def __init__(self, course_file=None, room_file=None, courses_df=None, rooms_df=None, block_morning_slots=False, blocked_slots=None,
+                 seed=None, max_time_in_seconds=300, num_search_workers=None, symmetry_level=2, linearization_level=2,
+                 warm_start=True, reuse_output=False):
+        """Initialize the AI scheduler.
+
+        The solver arguments are passed straight to CP-SAT; num_search_workers=None
+        uses up to 16 workers based on the CPU count. With warm_start, repeated
+        generate_timetable() calls hint the solver with the previous solution. With
+        reuse_output, a run whose inputs and solver settings match the fingerprint stored
+        in output_dir skips the solve and reloads that directory's schedules; a warm-started
+        rerun on an instance that has already solved always solves again.
+        """
         self.logger = logging.getLogger('agents.ai_scheduler')
         self.logger.info("Initializing AI-Enhanced Scheduler...")
 
@@ -33,6 +77,25 @@ class AIScheduler:
         self.block_morning_slots = block_morning_slots
         self.blocked_slots = blocked_slots  # (start_slot, end_slot) tuple for dynamic blocking
 
+        # Random source for the scatter weights in the objective (seed for reproducible runs)
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+
+        # CP-SAT tuning (rooms of one type make timetables highly symmetric). Interchangeable
+        # rooms are left to CP-SAT's symmetry detection: they keep one BoolVar each because
+        # TimetableConstraints works per room_id, and explicit room-ordering constraints
+        # solved several times slower than symmetry_level=2 on its own.
+        self.max_time_in_seconds = max_time_in_seconds
+        self.num_search_workers = num_search_workers or min(16, os.cpu_count() or 8)
+        self.symmetry_level = symmetry_level
+        self.linearization_level = linearization_level
+
+        # Last solved (course_id, day_idx, slot_idx, room_id) cells, used as hints on reruns
+        self.warm_start = warm_start
+        self._last_assignment = set()
+        self.reuse_output = reuse_output
+        self._fingerprint = None
+
         if blocked_slots:
             constraint_mode = f"blocked_{blocked_slots[0]}_to_{blocked_slots[1]}"
         elif block_morning_slots:
@@ -40,6 +103,10 @@ class AIScheduler:
         else:
             constraint_mode = "general_only"
 
+        # Seeded runs may start within the same second (see generate_variations)
+        if seed is not None:
+            constraint_mode += f"_seed{seed}"
+
         # Create output directory with constraint mode indicator
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.output_dir = f"output/ai_schedule_{timestamp}_{constraint_mode}"
@@ -62,6 +129,22 @@ class AIScheduler:
             # Create sample data if none provided
             self.rooms_df = self._create_sample_rooms()
 
+        # course_id -> row dict, so per-course lookups don't re-filter the DataFrame
+        self.course_info = self.courses_df.drop_duplicates('course_id').set_index('course_id').to_dict('index')
+        self.teacher_to_courses = self.courses_df.groupby('teacher_id')['course_id'].apply(list).to_dict()
+
+        # Per-course numeric columns as vectors (same first row per course_id), indexed via _course_pos
+        first_rows = self.courses_df.drop_duplicates('course_id')
+        self._course_pos = {course_id: pos for pos, course_id in enumerate(first_rows['course_id'])}
+        if 'sessions_per_week' in first_rows:
+            self._sessions = first_rows['sessions_per_week'].fillna(1).to_numpy(dtype=np.int64)
+        else:
+            self._sessions = np.ones(len(first_rows), dtype=np.int64)
+        if 'students_count' in first_rows:
+            self._students = pd.to_numeric(first_rows['students_count'], errors='coerce').to_numpy(dtype=float)
+        else:
+            self._students = np.full(len(first_rows), np.nan)
+
         # Time slot configurations (matching combined_scheduler.py)
         self.lab_time_slots = [
             "8:00-10:00", "10:10-12:10", "1:20-3:20",
@@ -73,17 +156,74 @@ class AIScheduler:
             "12:10-1:00", "1:20-2:10", "2:20-3:10", "3:30-4:20",
             "4:30-5:20", "5:30-6:20", "6:30-7:20"
         ]
+        self._theory_slot_index = {slot: idx for idx, slot in enumerate(self.theory_time_slots)}
 
         self.days = ['Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
 
+        # Blocked theory slot indices; lab slots are blocked when their time overlaps one of them
+        if blocked_slots:
+            start_slot, end_slot = blocked_slots
+            self._blocked_slot_set = set(range(start_slot, end_slot + 1))
+        elif block_morning_slots:
+            self._blocked_slot_set = {0, 1, 2, 3}  # 8:00-8:50, 9:00-9:50, 10:10-11:00, 11:10-12:00
+        else:
+            self._blocked_slot_set = set()
+        self._blocked_lab_slot_set = self._overlapping_lab_slots(self._blocked_slot_set)
+
+        # Slot indices that get variables at all; blocked slots are never schedulable
+        self.lab_slot_ids = [slot_idx for slot_idx in range(len(self.lab_time_slots))
+                             if slot_idx not in self._blocked_lab_slot_set]
+        self.theory_slot_ids = [slot_idx for slot_idx in range(len(self.theory_time_slots))
+                                if slot_idx not in self._blocked_slot_set]
+        # Per slot index: 0 = blocked, 1 = lunch, 2 = normal (lunch detected around 12-1 PM)
+        self._slot_kind = np.full(len(self.theory_time_slots), 2, dtype=np.int8)
+        for slot_idx, slot_time in enumerate(self.theory_time_slots):
+            if slot_idx == 4 or "12:10" in slot_time:
+                self._slot_kind[slot_idx] = 1
+        self._slot_kind[sorted(slot_idx for slot_idx in self._blocked_slot_set
+                               if slot_idx < len(self.theory_time_slots))] = 0
+
+        if self._blocked_slot_set:
+            self.logger.info(f"Blocked theory slots {sorted(self._blocked_slot_set)} and lab slots "
+                             f"{sorted(self._blocked_lab_slot_set)}: no variables are created for them")
+
         # Schedule storage
         self.lab_schedule = {}
         self.theory_schedule = {}
+        self._lab_count = 0
+        self._theory_count = 0
+        self.visualization_future = None
 
         self.logger.info(f"Courses loaded: {len(self.courses_df)}")
         self.logger.info(f"Rooms loaded: {len(self.rooms_df)}")
         self.logger.info(f"Output directory: {self.output_dir}")
 
+    @staticmethod
+    def _slot_minutes(time_slot):
+        """Convert a slot label like '1:20-3:20' to (start, end) minutes on a 24h clock."""
+        start, end = ((int(hour) * 60 + int(minute) for hour, minute in
+                       (part.strip().split(':') for part in time_slot.split('-'))))
+        if start < 8 * 60:  # Slot labels use a 12h clock; the day starts at 8:00
+            start += 12 * 60
+        while end <= start:  # A slot ends after it starts, e.g. '7:50-9:50' is 19:50-21:50
+            end += 12 * 60
+        return start, end
+
+    def _overlapping_lab_slots(self, theory_slot_set):
+        """Return indices of lab slots whose time overlaps any of the given theory slots."""
+        theory_ranges = [self._slot_minutes(self.theory_time_slots[slot_idx])
+                         for slot_idx in theory_slot_set if slot_idx < len(self.theory_time_slots)]
+        overlapping = set()
+        for slot_idx, time_slot in enumerate(self.lab_time_slots):
+            lab_start, lab_end = self._slot_minutes(time_slot)
+            if any(start < lab_end and lab_start < end for start, end in theory_ranges):
+                overlapping.add(slot_idx)
+        return overlapping
+
+    def theory_slot_index(self, time_slot):
+        """Return the index of a theory slot label like '8:00-8:50' (0 if unknown)."""
+        return self._theory_slot_index.get(time_slot, 0)
+
     def _create_sample_courses(self):
         """Create sample course data for testing."""
         courses_data = {
@@ -110,12 +250,25 @@ class AIScheduler:
         }
         return pd.DataFrame(rooms_data)
 
-    def generate_timetable(self):
-        """Generate timetable using AI-enhanced constraints."""
+    def generate_timetable(self, async_visualizations=False):
+        """Generate timetable using AI-enhanced constraints.
+
+        With async_visualizations the charts are rendered in the background once the
+        schedules are saved; see visualization_future / wait_for_visualizations().
+        """
         self.logger.info("="*80)
         self.logger.info("STARTING AI-ENHANCED TIMETABLE GENERATION")
         self.logger.info("="*80)
 
+        # Skip the solve (and rendering) when this output_dir already holds a run of identical inputs,
+        # unless a warm start from this instance's last solution asks for a fresh, improved solve
+        self._fingerprint = self._compute_fingerprint()
+        fresh_solve = self.warm_start and self._last_assignment
+        if (self.reuse_output and not fresh_solve and self._stored_fingerprint() == self._fingerprint
+                and self._load_previous_output(self.output_dir)):
+            self.logger.info(f"♻️ Inputs unchanged since the last run in {self.output_dir}: reusing its schedules and visualizations")
+            return True
+
         # Create CP-SAT model
         model = cp_model.CpModel()
 
@@ -139,195 +292,266 @@ class AIScheduler:
 
         # Add optimization objectives
         self.logger.info("Setting up optimization objectives...")
-        self._add_objectives(model, lab_variables, theory_variables)
+        self._add_objectives(model)
+
+        if self.warm_start and self._last_assignment:
+            self._apply_hints(model)
 
         # Solve the model
         self.logger.info("Solving the scheduling model...")
-        success = self._solve_model(model, lab_variables, theory_variables)
+        success = self._solve_model(model)
 
         if success:
-            self.logger.info("✅ Timetable generation completed successfully!")
+            self.logger.info("Timetable generation completed successfully!")
 
             # Save schedules
             self._save_schedules()
 
             # Generate visualizations
-            self._generate_visualizations()
+            if async_visualizations:
+                self.visualization_future = _VIZ_POOL.submit(self._generate_visualizations)
+            else:
+                self._generate_visualizations()
 
             return True
         else:
-            self.logger.error("❌ Failed to generate timetable")
+            self.logger.error("Failed to generate timetable")
             return False
 
-    def _create_lab_variables(self, model):
-        """Create variables for lab sessions."""
-        lab_variables = {}
-
-        # Get lab courses
-        lab_courses = self.courses_df[self.courses_df['session_type'] == 'lab']
-        lab_rooms = self.rooms_df[self.rooms_df['type'].str.contains('lab', case=False)]
-
-        for _, course in lab_courses.iterrows():
-            course_id = course['course_id']
-            lab_variables[course_id] = {}
+    def _compute_fingerprint(self):
+        """Hash everything a solve depends on: course/room data, the CSVs TimetableConstraints reads,
+        blocking, seed, solver settings, constraints.py and this module."""
+        digest = hashlib.blake2b(digest_size=16)
+        for df in (self.courses_df, self.rooms_df):
+            digest.update(repr(list(df.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        code_versions = []
+        for path in (CONSTRAINTS_FILE, SCHEDULER_FILE):
+            try:
+                code_versions.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                code_versions.append(None)
+        solver_settings = (self.max_time_in_seconds, self.num_search_workers,
+                           self.symmetry_level, self.linearization_level)
+        digest.update(repr((sorted(self._blocked_slot_set), self.seed, solver_settings, code_versions,
+                            TimetableConstraints.data_file_stamps())).encode())
+        return digest.hexdigest()
+
+    def _stored_fingerprint(self):
+        """Return the fingerprint saved with the last complete run in output_dir, if any."""
+        try:
+            with open(os.path.join(self.output_dir, FINGERPRINT_FILE)) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _load_previous_output(self, output_dir):
+        """Rebuild lab/theory schedules from an earlier run's JSON files; False if unreadable."""
+        # The flat JSON stores visualizer day names and stringified ids
+        day_by_name = {name: day for day, name in self.DAY_MAPPING.items()}
+        course_by_str = {str(course_id): course_id for course_id in self.course_info}
+        room_by_str = {str(room_id): room_id for room_id in self.rooms_df['room_id']}
+
+        schedules = []
+        try:
+            for filename in ('ai_lab_schedule.json', 'ai_theory_schedule.json'):
+                with open(os.path.join(output_dir, filename), 'rb') as f:
+                    entries = orjson.loads(f.read()) if orjson is not None else json.load(f)
+                schedule = {}
+                for entry in entries:
+                    day = day_by_name.get(entry['day'], entry['day'])
+                    room_id = room_by_str.get(entry['room_id'], entry['room_id'])
+                    schedule.setdefault(day, {}).setdefault(entry['time_slot'], {})[room_id] = \
+                        course_by_str.get(entry['course_id'], entry['course_id'])
+                schedules.append((schedule, len(entries)))
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Could not reuse {output_dir}: {e}")
+            return False
 
-            for day_idx, day in enumerate(self.days):
-                lab_variables[course_id][day_idx] = {}
+        (self.lab_schedule, self._lab_count), (self.theory_schedule, self._theory_count) = schedules
+        return True
 
-                for slot_idx, slot in enumerate(self.lab_time_slots):
-                    lab_variables[course_id][day_idx][slot_idx] = {}
+    def _create_lab_variables(self, model):
+        """Create variables for lab sessions."""
+        # Plain id lists hoisted out of the loops (no per-row pandas objects)
+        lab_course_ids = self.courses_df.loc[self.courses_df['session_type'] == 'lab', 'course_id'].tolist()
+        self.lab_course_rooms = self._suitable_rooms(lab_course_ids, self.rooms_df['type'].str.contains('lab', case=False))
 
-                    for _, room in lab_rooms.iterrows():
-                        room_id = room['room_id']
-                        var_name = f"lab_{course_id}_{day}_{slot}_{room_id}"
-                        lab_variables[course_id][day_idx][slot_idx][room_id] = model.NewBoolVar(var_name)
+        self.lab_var_arr = self._build_var_arrays(model, 'lab', self.lab_course_rooms, self.lab_slot_ids, self.lab_time_slots)
 
-        self.logger.info(f"Created lab variables for {len(lab_courses)} courses")
-        return lab_variables
+        self.logger.info(f"Created lab variables for {len(lab_course_ids)} courses")
+        return self._to_nested_variables(self.lab_var_arr, self.lab_slot_ids, self.lab_course_rooms)
 
     def _create_theory_variables(self, model):
         """Create variables for theory sessions."""
-        theory_variables = {}
-
-        # Get theory courses
-        theory_courses = self.courses_df[self.courses_df['session_type'] == 'theory']
-        theory_rooms = self.rooms_df[self.rooms_df['type'] == 'theory']
-
-        for _, course in theory_courses.iterrows():
-            course_id = course['course_id']
-            theory_variables[course_id] = {}
+        theory_course_ids = self.courses_df.loc[self.courses_df['session_type'] == 'theory', 'course_id'].tolist()
+        self.theory_course_rooms = self._suitable_rooms(theory_course_ids, self.rooms_df['type'] == 'theory')
 
-            for day_idx, day in enumerate(self.days):
-                theory_variables[course_id][day_idx] = {}
+        self.theory_var_arr = self._build_var_arrays(model, 'theory', self.theory_course_rooms, self.theory_slot_ids,
+                                                     self.theory_time_slots)
 
-                for slot_idx, slot in enumerate(self.theory_time_slots):
-                    theory_variables[course_id][day_idx][slot_idx] = {}
+        self.logger.info(f"Created theory variables for {len(theory_course_ids)} courses")
+        return self._to_nested_variables(self.theory_var_arr, self.theory_slot_ids, self.theory_course_rooms)
 
-                    for _, room in theory_rooms.iterrows():
-                        room_id = room['room_id']
-                        var_name = f"theory_{course_id}_{day}_{slot}_{room_id}"
-                        theory_variables[course_id][day_idx][slot_idx][room_id] = model.NewBoolVar(var_name)
+    def _suitable_rooms(self, course_ids, room_type_mask):
+        """Map course_id -> ids of rooms of the right type that can seat its students."""
+        candidate_rooms = self.rooms_df.loc[room_type_mask]
+        room_ids = candidate_rooms['room_id'].tolist()
+        if 'capacity' in candidate_rooms:
+            capacities = pd.to_numeric(candidate_rooms['capacity'], errors='coerce').to_numpy(dtype=float)
+        else:
+            capacities = np.full(len(room_ids), np.nan)
+
+        # (courses, rooms) fit matrix in one comparison; unknown capacities or class sizes always fit
+        students = self._students[[self._course_pos[course_id] for course_id in course_ids]]
+        fits = np.isnan(capacities)[None, :] | (capacities[None, :] >= students[:, None])
+        fits[np.isnan(students)] = True
+
+        course_rooms = {}
+        for course_id, students_count, course_fits in zip(course_ids, students, fits):
+            rooms = [room_ids[room_idx] for room_idx in np.flatnonzero(course_fits)]
+            if not rooms and room_ids:
+                self.logger.warning(f"No room can seat {students_count:g} students for {course_id}; "
+                                    f"considering all {len(room_ids)} rooms of its type")
+                rooms = room_ids
+            course_rooms[course_id] = rooms
+
+        return course_rooms
+
+    def _build_var_arrays(self, model, prefix, course_rooms, slot_ids, time_slots):
+        """Build course_id -> np.ndarray(shape=(days, slots, rooms), dtype=object) of BoolVars.
+
+        The slot axis only covers schedulable slots (see lab_slot_ids / theory_slot_ids)
+        and the room axis follows course_rooms[course_id].
+        """
+        # Names are only useful in debug model dumps; CP-SAT accepts empty names
+        # and skips the per-variable string formatting and copy
+        named = self.logger.isEnabledFor(logging.DEBUG)
+        var_arrays = {}
+
+        for course_id, room_ids in course_rooms.items():
+            shape = (len(self.days), len(slot_ids), len(room_ids))
+            vars_arr = np.empty(shape, dtype=object)
+            for day_idx, slot_pos, room_idx in np.ndindex(shape):
+                name = ""
+                if named:
+                    name = (f"{prefix}_{course_id}_{self.days[day_idx]}_"
+                            f"{time_slots[slot_ids[slot_pos]]}_{room_ids[room_idx]}")
+                vars_arr[day_idx, slot_pos, room_idx] = model.NewBoolVar(name)
+            var_arrays[course_id] = vars_arr
+
+        return var_arrays
+
+    def _to_nested_variables(self, var_arrays, slot_ids, course_rooms):
+        """Expose arrays as variables[course_id][day_idx][slot_idx][room_id] for TimetableConstraints.
+
+        Blocked slots and unsuitable rooms have no entry, so they are simply not schedulable.
+        """
+        return {
+            course_id: {
+                day_idx: {
+                    slot_idx: dict(zip(course_rooms[course_id], vars_arr[day_idx, slot_pos].tolist()))
+                    for slot_pos, slot_idx in enumerate(slot_ids)
+                }
+                for day_idx in range(vars_arr.shape[0])
+            }
+            for course_id, vars_arr in var_arrays.items()
+        }
 
-        self.logger.info(f"Created theory variables for {len(theory_courses)} courses")
-        return theory_variables
+    def _all_var_arrays(self):
+        """Return (course_id, vars_arr) pairs for lab courses followed by theory courses."""
+        return list(self.lab_var_arr.items()) + list(self.theory_var_arr.items())
 
-    def _add_objectives(self, model, lab_variables, theory_variables):
+    def _add_objectives(self, model):
         """Add optimization objectives and session limits."""
-        # Add session per week constraints for each course
-        for course_id, course_vars in list(lab_variables.items()) + list(theory_variables.items()):
-            # Get the required sessions per week for this course
-            course_info = self.courses_df[self.courses_df['course_id'] == course_id]
-            if not course_info.empty:
-                sessions_per_week = int(course_info.iloc[0].get('sessions_per_week', 1))
-
-                # Count total sessions scheduled for this course
-                all_sessions = []
-                for day_idx in course_vars:
-                    for slot_idx in course_vars[day_idx]:
-                        for room_vars in course_vars[day_idx][slot_idx].values():
-                            all_sessions.append(room_vars)
-
-                # Constraint: exactly sessions_per_week sessions
-                if all_sessions:
-                    model.Add(sum(all_sessions) == sessions_per_week)
-                    self.logger.info(f"Added session limit for {course_id}: {sessions_per_week} sessions/week")
+        # Add session per week (and per day) constraints for each course
+        self._add_session_constraints(model)
 
         # Add better distribution constraints and optional morning block
-        self._add_distribution_constraints(model, lab_variables, theory_variables)
+        self._add_distribution_constraints(model)
 
         # Add mandatory scattering constraints
-        self._add_mandatory_scattering(model, lab_variables, theory_variables)
-
-        # Add dynamic slot blocking if enabled
-        if self.block_morning_slots or self.blocked_slots:
-            self._add_dynamic_block_constraint(model, lab_variables, theory_variables)
+        self._add_mandatory_scattering(model)
 
         # Improved objective: Balance utilization across time slots
-        objective_terms = []
+        # (parallel var/weight lists feed a single WeightedSum)
+        objective_vars = []
+        objective_weights = []
 
         # 1. Encourage different teachers to teach at same time (avoid gaps)
         # Instead of penalizing consecutive slots with complex multiplication,
         # we'll use a simpler approach with distribution constraints
 
         # 2. Encourage spread across different time periods
-        for course_vars in list(lab_variables.values()) + list(theory_variables.values()):
-            for day_idx in range(len(self.days)):
-                if day_idx in course_vars:
-                    for slot_idx in course_vars[day_idx]:
-                        # Generate random scattered distribution with dynamic blocking
-                        is_blocked_slot = False
-
-                        if self.blocked_slots:
-                            # Dynamic blocking - check if slot is in blocked range
-                            start_slot, end_slot = self.blocked_slots
-                            is_blocked_slot = start_slot <= slot_idx <= end_slot
-                        elif self.block_morning_slots:
-                            # Legacy morning blocking
-                            is_blocked_slot = slot_idx < 4
-
-                        if is_blocked_slot:
-                            slot_weight = 0  # These will be blocked anyway
-                        else:
-                            # Available slots - randomize for scatter
-                            # Detect lunch time dynamically (around 12-1 PM range)
-                            slot_time = self.theory_time_slots[slot_idx] if slot_idx < len(self.theory_time_slots) else "Unknown"
-                            is_lunch_time = slot_idx == 4 or (isinstance(slot_time, str) and "12:10-1:00" in slot_time)
-
-                            if is_lunch_time:
-                                slot_weight = random.randint(1, 3)  # Lower preference for lunch
-                            else:  # All other available slots - randomize
-                                slot_weight = random.randint(4, 9)  # Random preference for scattering
-
-                        for room_vars in course_vars[day_idx][slot_idx].values():
-                            objective_terms.append(slot_weight * room_vars)
-
-        if objective_terms:
-            model.Maximize(sum(objective_terms))
-
-    def _add_distribution_constraints(self, model, lab_variables, theory_variables):
+        # Blocked slots have no variables; lunch status depends only on slot_idx
+        for var_arrays, slot_ids in ((self.lab_var_arr, self.lab_slot_ids),
+                                     (self.theory_var_arr, self.theory_slot_ids)):
+            lunch_mask = self._slot_kind[slot_ids] == 1
+
+            for vars_arr in var_arrays.values():
+                num_days, num_slots, num_rooms = vars_arr.shape
+
+                # Random scattered distribution: lower preference for lunch
+                slot_weights = np.where(
+                    lunch_mask,
+                    self._rng.integers(1, 4, size=(num_days, num_slots)),
+                    self._rng.integers(4, 10, size=(num_days, num_slots))
+                )
+
+                objective_vars.extend(vars_arr.ravel().tolist())
+                objective_weights.extend(np.repeat(slot_weights.ravel(), num_rooms).tolist())
+
+        if objective_vars:
+            model.Maximize(cp_model.LinearExpr.WeightedSum(objective_vars, objective_weights))
+
+    def _add_session_constraints(self, model):
+        """Add exact sessions-per-week and max-per-day limits, one flatten per course."""
+        for course_id, vars_arr in self._all_var_arrays():
+            # Get the required sessions per week for this course
+            course_info = self.course_info.get(course_id)
+            if not course_info:
+                continue
+            sessions_per_week = int(self._sessions[self._course_pos[course_id]])
+
+            # One (days, slots * rooms) view of the course feeds both constraints
+            day_sessions = vars_arr.reshape(vars_arr.shape[0], -1).tolist()
+            all_sessions = [var for day_vars in day_sessions for var in day_vars]
+
+            # Constraint: exactly sessions_per_week sessions
+            if all_sessions:
+                model.Add(cp_model.LinearExpr.Sum(all_sessions) == sessions_per_week)
+                self.logger.info(f"Added session limit for {course_id}: {sessions_per_week} sessions/week")
+
+            # Spread courses across different days
+            if sessions_per_week > 1:
+                # At most 1 session per day for theory courses
+                session_type = course_info.get('session_type', 'theory')
+                max_per_day = 1 if session_type == 'theory' else 2
+
+                for day_vars in day_sessions:
+                    if not day_vars:
+                        continue
+                    if max_per_day == 1:
+                        model.AddAtMostOne(day_vars)
+                    else:
+                        model.Add(cp_model.LinearExpr.Sum(day_vars) <= max_per_day)
+
+    def _add_distribution_constraints(self, model):
         """Add improved constraints for better time distribution and scattering."""
-        # 1. Spread courses across different days
-        for course_id, course_vars in list(lab_variables.items()) + list(theory_variables.items()):
-            course_info = self.courses_df[self.courses_df['course_id'] == course_id]
-            if not course_info.empty:
-                sessions_per_week = int(course_info.iloc[0].get('sessions_per_week', 1))
-
-                if sessions_per_week > 1:
-                    # At most 1 session per day for theory courses
-                    session_type = course_info.iloc[0].get('session_type', 'theory')
-                    max_per_day = 1 if session_type == 'theory' else 2
-
-                    for day_idx in course_vars:
-                        day_sessions = []
-                        for slot_idx in course_vars[day_idx]:
-                            for room_vars in course_vars[day_idx][slot_idx].values():
-                                day_sessions.append(room_vars)
-
-                        if day_sessions:
-                            model.Add(sum(day_sessions) <= max_per_day)
+        # 1. Spreading across days is posted with the session limits (_add_session_constraints)
 
         # 2. Add time slot diversity constraints for better scattering
-        self._add_time_diversity_constraints(model, lab_variables, theory_variables)
+        self._add_time_diversity_constraints(model)
 
         # 3. Prevent clustering in consecutive slots
-        self._add_anti_clustering_constraints(model, lab_variables, theory_variables)
+        self._add_anti_clustering_constraints(model)
 
         self.logger.info("Applied ENHANCED distribution constraints for better scattering")
 
-    def _add_time_diversity_constraints(self, model, lab_variables, theory_variables):
+    def _add_time_diversity_constraints(self, model):
         """Add constraints to encourage diversity in time slot usage."""
-        # Dynamically determine available slots
-        all_slots = list(range(len(self.theory_time_slots)))
-        blocked_slots_set = set()
-
-        # Get blocked slots dynamically
-        if self.blocked_slots:
-            start_slot, end_slot = self.blocked_slots
-            blocked_slots_set = set(range(start_slot, end_slot + 1))
-        elif self.block_morning_slots:
-            blocked_slots_set = set([0, 1, 2, 3])
-
-        available_slots = [slot for slot in all_slots if slot not in blocked_slots_set]
+        # Only unblocked slots have variables; periods hold positions on the array slot axis
+        available_slots = list(range(len(self.theory_slot_ids)))
 
         # Create dynamic time periods from available slots
         if len(available_slots) >= 4:
@@ -344,115 +568,52 @@ class AIScheduler:
         # For each day, limit sessions per period to encourage spreading
         for day_idx in range(len(self.days)):
             for period in periods:
-                period_sessions = []
-
                 # Theory sessions in this period
-                for course_vars in theory_variables.values():
-                    if day_idx in course_vars:
-                        for slot_idx in period:
-                            if slot_idx in course_vars[day_idx]:
-                                for room_vars in course_vars[day_idx][slot_idx].values():
-                                    period_sessions.append(room_vars)
+                period_sessions = [
+                    room_var
+                    for vars_arr in self.theory_var_arr.values()
+                    for room_var in vars_arr[day_idx, period].ravel().tolist()
+                ]
 
                 # Limit sessions per period to encourage spreading
                 if period_sessions and len(periods) > 1:
                     max_per_period = max(1, len(available_slots) // len(periods) + 1)
-                    model.Add(sum(period_sessions) <= max_per_period)
+                    model.Add(cp_model.LinearExpr.Sum(period_sessions) <= max_per_period)
 
-    def _add_anti_clustering_constraints(self, model, lab_variables, theory_variables):
+    def _add_anti_clustering_constraints(self, model):
         """Add constraints to prevent clustering of classes in consecutive slots."""
         # For each teacher, prevent too many consecutive classes
-        teacher_ids = self.courses_df['teacher_id'].unique()
-
-        for teacher_id in teacher_ids:
-            teacher_courses = self.courses_df[self.courses_df['teacher_id'] == teacher_id]['course_id'].tolist()
+        for teacher_id, course_ids in self.teacher_to_courses.items():
+            teacher_theory_arrs = [self.theory_var_arr[course_id] for course_id in course_ids
+                                   if course_id in self.theory_var_arr]
+            if not teacher_theory_arrs:
+                continue
 
             for day_idx in range(len(self.days)):
-                # Check consecutive slots for this teacher
-                for slot_idx in range(len(self.theory_time_slots) - 1):
-                    current_slot_vars = []
-                    next_slot_vars = []
-
-                    # Collect variables for current and next slot for this teacher
-                    for course_id in teacher_courses:
-                        if course_id in theory_variables:
-                            course_vars = theory_variables[course_id]
-                            if day_idx in course_vars:
-                                if slot_idx in course_vars[day_idx]:
-                                    for room_vars in course_vars[day_idx][slot_idx].values():
-                                        current_slot_vars.append(room_vars)
-
-                                if slot_idx + 1 in course_vars[day_idx]:
-                                    for room_vars in course_vars[day_idx][slot_idx + 1].values():
-                                        next_slot_vars.append(room_vars)
-
-                    # Constraint: if teacher has class in current slot,
-                    # limit probability of having class in next slot
-                    if current_slot_vars and next_slot_vars:
+                # Check consecutive slots for this teacher (skipping pairs split by a blocked slot)
+                for slot_pos in range(len(self.theory_slot_ids) - 1):
+                    if self.theory_slot_ids[slot_pos + 1] != self.theory_slot_ids[slot_pos] + 1:
+                        continue
+
+                    # All of this teacher's theory variables in the current and next slot
+                    pair_vars = [var for vars_arr in teacher_theory_arrs
+                                 for var in vars_arr[day_idx, slot_pos:slot_pos + 2].ravel().tolist()]
+
+                    if pair_vars:
                         # At most one session for this teacher in consecutive slots
-                        model.Add(sum(current_slot_vars) + sum(next_slot_vars) <= 1)
-
-    def _add_dynamic_block_constraint(self, model, lab_variables, theory_variables):
-        """Add constraint to block classes for any dynamic time range."""
-        if self.blocked_slots:
-            # Use dynamic slot range
-            start_slot, end_slot = self.blocked_slots
-            blocked_slots = list(range(start_slot, end_slot + 1))
-            block_description = f"slots {start_slot}-{end_slot}"
-        else:
-            # Use default morning block (backward compatibility)
-            blocked_slots = [0, 1, 2, 3]  # 8:00-8:50, 9:00-9:50, 10:10-11:00, 11:10-12:00
-            block_description = "morning slots (8-11:30 AM)"
-
-        constraints_applied = 0
-
-        # Block specified slots for theory classes
-        for course_vars in theory_variables.values():
-            for day_idx in course_vars:
-                for slot_idx in blocked_slots:
-                    if slot_idx in course_vars[day_idx]:
-                        for room_vars in course_vars[day_idx][slot_idx].values():
-                            model.Add(room_vars == 0)
-                            constraints_applied += 1
-
-        # Block specified slots for lab classes
-        for course_vars in lab_variables.values():
-            for day_idx in course_vars:
-                for slot_idx in blocked_slots:
-                    if slot_idx in course_vars[day_idx]:
-                        for room_vars in course_vars[day_idx][slot_idx].values():
-                            model.Add(room_vars == 0)
-                            constraints_applied += 1
-
-        self.logger.info(f"🚫 APPLIED DYNAMIC BLOCK ({block_description}): {constraints_applied} slots blocked")
-
-    def _add_mandatory_scattering(self, model, lab_variables, theory_variables):
+                        model.AddAtMostOne(pair_vars)
+
+    def _add_mandatory_scattering(self, model):
         """Add hard constraints to force scattering across multiple time slots."""
         # Count total sessions that need to be scheduled
-        total_theory_sessions = 0
-        for course_id, course_vars in theory_variables.items():
-            course_info = self.courses_df[self.courses_df['course_id'] == course_id]
-            if not course_info.empty:
-                sessions_per_week = int(course_info.iloc[0].get('sessions_per_week', 1))
-                total_theory_sessions += sessions_per_week
+        total_theory_sessions = int(self._sessions[[self._course_pos[course_id] for course_id in self.theory_var_arr]].sum())
 
         if total_theory_sessions > 1:
-            # Dynamically determine available slots based on any blocking
-            all_slots = list(range(len(self.theory_time_slots)))
-            blocked_slots_set = set()
-
-            # Get blocked slots dynamically
-            if self.blocked_slots:
-                start_slot, end_slot = self.blocked_slots
-                blocked_slots_set = set(range(start_slot, end_slot + 1))
-            elif self.block_morning_slots:
-                blocked_slots_set = set([0, 1, 2, 3])  # Legacy support
-
-            # Calculate available slots
-            available_slots = [slot for slot in all_slots if slot not in blocked_slots_set]
-
-            if blocked_slots_set:
-                self.logger.info(f"Forcing scattering across {len(available_slots)} available slots (blocked: {sorted(blocked_slots_set)})")
+            # Blocked slots never got variables, so every theory slot id is available
+            available_slots = self.theory_slot_ids
+
+            if self._blocked_slot_set:
+                self.logger.info(f"Forcing scattering across {len(available_slots)} available slots (blocked: {sorted(self._blocked_slot_set)})")
             else:
                 self.logger.info(f"Forcing scattering across {len(available_slots)} total slots")
 
@@ -460,90 +621,104 @@ class AIScheduler:
             if total_theory_sessions >= 2 and len(available_slots) >= 2:
                 slot_usage_vars = []
 
-                for slot_idx in available_slots:
+                for slot_pos, slot_idx in enumerate(available_slots):
                     # Create a boolean variable for whether this slot is used
                     slot_used_var = model.NewBoolVar(f"slot_{slot_idx}_used")
                     slot_usage_vars.append(slot_used_var)
 
                     # Collect all sessions in this slot (only from available slots)
-                    slot_sessions = []
-                    for course_vars in theory_variables.values():
-                        for day_idx in course_vars:
-                            if slot_idx in course_vars[day_idx]:
-                                for room_vars in course_vars[day_idx][slot_idx].values():
-                                    slot_sessions.append(room_vars)
+                    slot_sessions = [
+                        room_var
+                        for vars_arr in self.theory_var_arr.values()
+                        for room_var in vars_arr[:, slot_pos].ravel().tolist()
+                    ]
 
                     if slot_sessions:
-                        # Link slot usage to actual sessions
-                        # If any session is scheduled in this slot, mark slot as used
-                        model.Add(sum(slot_sessions) <= len(slot_sessions) * slot_used_var)
-                        # If slot is marked as used, at least one session must be scheduled
-                        model.Add(sum(slot_sessions) >= slot_used_var)
+                        # Link slot usage to actual sessions: the slot is used iff any session is scheduled in it
+                        model.AddMaxEquality(slot_used_var, slot_sessions)
 
                 # Force usage of at least 2-3 different slots for better distribution
                 min_slots = min(3, len(available_slots), total_theory_sessions)
                 if min_slots >= 2:
-                    model.Add(sum(slot_usage_vars) >= min_slots)
+                    model.Add(cp_model.LinearExpr.Sum(slot_usage_vars) >= min_slots)
                     self.logger.info(f"MANDATORY SCATTERING: At least {min_slots} different available slots must be used")
 
-    def _solve_model(self, model, lab_variables, theory_variables):
+    def _apply_hints(self, model):
+        """Hint every variable with its value in the previous solution (missing cells hint 0)."""
+        hinted = 0
+        for var_arrays, slot_ids, course_rooms in ((self.lab_var_arr, self.lab_slot_ids, self.lab_course_rooms),
+                                                   (self.theory_var_arr, self.theory_slot_ids, self.theory_course_rooms)):
+            for course_id, vars_arr in var_arrays.items():
+                room_ids = course_rooms[course_id]
+                for (day_idx, slot_pos, room_idx), var in np.ndenumerate(vars_arr):
+                    value = (course_id, day_idx, slot_ids[slot_pos], room_ids[room_idx]) in self._last_assignment
+                    model.AddHint(var, value)
+                    hinted += value
+        self.logger.info(f"Warm start: hinted {hinted} of {len(self._last_assignment)} previous assignments")
+
+    def _solve_model(self, model):
         """Solve the scheduling model."""
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 300  # 5 minutes timeout
-
-        self.logger.info("Starting solver...")
+        params = solver.parameters
+        params.max_time_in_seconds = self.max_time_in_seconds  # 5 minutes timeout by default
+        # Run the portfolio + LNS workers in parallel (presolve stays single-threaded)
+        params.num_search_workers = self.num_search_workers
+        params.cp_model_presolve = True
+        params.symmetry_level = self.symmetry_level
+        params.linearization_level = self.linearization_level
+        params.log_search_progress = self.logger.isEnabledFor(logging.DEBUG)
+        if self.seed is not None:
+            params.random_seed = self.seed
+
+        self.logger.info(f"Starting solver with {solver.parameters.num_search_workers} workers...")
         status = solver.Solve(model)
 
         if status == cp_model.OPTIMAL:
-            self.logger.info("✅ Optimal solution found!")
-            self._extract_solution(solver, lab_variables, theory_variables)
+            self.logger.info("Optimal solution found!")
+            self._extract_solution(solver)
             return True
         elif status == cp_model.FEASIBLE:
-            self.logger.info("✅ Feasible solution found!")
-            self._extract_solution(solver, lab_variables, theory_variables)
+            self.logger.info("Feasible solution found!")
+            self._extract_solution(solver)
             return True
         else:
-            self.logger.error(f"❌ No solution found. Status: {solver.StatusName(status)}")
+            self.logger.error(f"No solution found. Status: {solver.StatusName(status)}")
             return False
 
-    def _extract_solution(self, solver, lab_variables, theory_variables):
+    def _extract_solution(self, solver):
         """Extract solution from the solver."""
         self.logger.info("Extracting solution...")
+        self.lab_schedule = {}
+        self.theory_schedule = {}
+        self._last_assignment = set()
 
         # Extract lab schedule
-        for course_id, course_vars in lab_variables.items():
-            for day_idx in course_vars:
-                for slot_idx in course_vars[day_idx]:
-                    for room_id, var in course_vars[day_idx][slot_idx].items():
-                        if solver.Value(var) == 1:
-                            day = self.days[day_idx]
-                            slot = self.lab_time_slots[slot_idx]
-
-                            if day not in self.lab_schedule:
-                                self.lab_schedule[day] = {}
-                            if slot not in self.lab_schedule[day]:
-                                self.lab_schedule[day][slot] = {}
-
-                            self.lab_schedule[day][slot][room_id] = course_id
+        lab_count = self._extract_schedule(solver, self.lab_var_arr, self.lab_slot_ids, self.lab_course_rooms, self.lab_time_slots, self.lab_schedule)
 
         # Extract theory schedule
-        for course_id, course_vars in theory_variables.items():
-            for day_idx in course_vars:
-                for slot_idx in course_vars[day_idx]:
-                    for room_id, var in course_vars[day_idx][slot_idx].items():
-                        if solver.Value(var) == 1:
-                            day = self.days[day_idx]
-                            slot = self.theory_time_slots[slot_idx]
-
-                            if day not in self.theory_schedule:
-                                self.theory_schedule[day] = {}
-                            if slot not in self.theory_schedule[day]:
-                                self.theory_schedule[day][slot] = {}
-
-                            self.theory_schedule[day][slot][room_id] = course_id
-
-        self.logger.info(f"Lab sessions scheduled: {sum(len(slots.values()) for day_slots in self.lab_schedule.values() for slots in day_slots.values())}")
-        self.logger.info(f"Theory sessions scheduled: {sum(len(slots.values()) for day_slots in self.theory_schedule.values() for slots in day_slots.values())}")
+        theory_count = self._extract_schedule(solver, self.theory_var_arr, self.theory_slot_ids, self.theory_course_rooms, self.theory_time_slots, self.theory_schedule)
+
+        self._lab_count = lab_count
+        self._theory_count = theory_count
+        self.logger.info(f"Lab sessions scheduled: {lab_count}")
+        self.logger.info(f"Theory sessions scheduled: {theory_count}")
+
+    def _extract_schedule(self, solver, var_arrays, slot_ids, course_rooms, time_slots, schedule):
+        """Fill schedule[day][slot][room_id] = course_id from solved variable arrays; returns the session count."""
+        count = 0
+        for course_id, vars_arr in var_arrays.items():
+            room_ids = course_rooms[course_id]
+            # Read the whole course at once; sessions are sparse, so only visit the true cells
+            values = np.fromiter((solver.BooleanValue(var) for var in vars_arr.ravel()),
+                                 dtype=bool, count=vars_arr.size).reshape(vars_arr.shape)
+
+            for day_idx, slot_pos, room_idx in zip(*np.nonzero(values)):
+                day = self.days[day_idx]
+                slot = time_slots[slot_ids[slot_pos]]
+                schedule.setdefault(day, {}).setdefault(slot, {})[room_ids[room_idx]] = course_id
+                self._last_assignment.add((course_id, day_idx, slot_ids[slot_pos], room_ids[room_idx]))
+                count += 1
+        return count
 
     def _save_schedules(self):
         """Save schedules to JSON files in format expected by visualization."""
@@ -554,82 +729,71 @@ class AIScheduler:
         lab_data = self._convert_to_flat_format(self.lab_schedule, 'lab')
         theory_data = self._convert_to_flat_format(self.theory_schedule, 'theory')
 
-        with open(lab_file, 'w') as f:
-            json.dump(lab_data, f, indent=2)
+        self._write_json(lab_file, lab_data)
+        self._write_json(theory_file, theory_data)
 
-        with open(theory_file, 'w') as f:
-            json.dump(theory_data, f, indent=2)
+        # Written last, so only complete outputs are ever reused
+        with open(os.path.join(self.output_dir, FINGERPRINT_FILE), 'w') as f:
+            f.write(self._fingerprint or '')
 
         self.logger.info(f"Lab schedule saved: {lab_file}")
         self.logger.info(f"Theory schedule saved: {theory_file}")
 
+    @staticmethod
+    def _write_json(path, data):
+        """Write data as indented JSON, through orjson when it is installed."""
+        if orjson is not None:
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=2)
+
     def _convert_to_flat_format(self, schedule_dict, session_type):
         """Convert nested schedule to flat format expected by visualization."""
-        flat_data = []
-
-        # Map our days to visualizer expected format
-        day_mapping = {
-            'Tuesday': 'tuesday',
-            'Wednesday': 'wed',
-            'Thursday': 'thur',
-            'Friday': 'fri',
-            'Saturday': 'sat'
+        return [
+            self._flat_entry(day, time_slot, room_id, course_id, session_type)
+            for day, day_schedule in schedule_dict.items()
+            for time_slot, slot_assignments in day_schedule.items()
+            for room_id, course_id in slot_assignments.items()
+            if self.course_info.get(course_id)
+        ]
+
+    def _flat_entry(self, day, time_slot, room_id, course_id, session_type):
+        """Build one visualization entry from the cached course_info row."""
+        course_data = self.course_info[course_id]
+        teacher_id = course_data.get('teacher_id', '1')
+
+        # Add required fields for visualization compatibility
+        entry = {
+            'day': str(self.DAY_MAPPING.get(day, day.lower())),
+            'time_slot': str(time_slot),
+            'room_id': str(room_id),
+            'room_number': str(room_id),  # Add for compatibility
+            'course_id': str(course_id),
+            'course_code': str(course_id),
+            'course_name': str(course_data.get('course_name', course_id)),
+            'teacher_id': str(teacher_id),
+            'teacher_name': str(course_data.get('teacher_name', f"Teacher {teacher_id}")),
+            'department': str(course_data.get('department', 'Unknown')),
+            'semester': int(course_data.get('semester', 1)),
+            'year': int(course_data.get('Year', 1)),
+            'session_type': str(session_type),
+            'students_count': int(course_data.get('students_count', 30)),
+            'block': 'A Block',  # Default block for visualization
+            'staff_code': f"ST{teacher_id}"  # Add staff code
         }
 
-        for day, day_schedule in schedule_dict.items():
-            viz_day = day_mapping.get(day, day.lower())
-
-            for time_slot, slot_assignments in day_schedule.items():
-                for room_id, course_id in slot_assignments.items():
-                    # Get course info
-                    course_info = self.courses_df[self.courses_df['course_id'] == course_id]
-                    if not course_info.empty:
-                        course_data = course_info.iloc[0]
-
-                        # Add required fields for visualization compatibility
-                        entry = {
-                            'day': str(viz_day),
-                            'time_slot': str(time_slot),
-                            'room_id': str(room_id),
-                            'room_number': str(room_id),  # Add for compatibility
-                            'course_id': str(course_id),
-                            'course_code': str(course_id),
-                            'course_name': str(course_data.get('course_name', course_id)),
-                            'teacher_id': str(course_data.get('teacher_id', '1')),
-                            'teacher_name': str(course_data.get('teacher_name', f"Teacher {course_data.get('teacher_id', '1')}")),
-                            'department': str(course_data.get('department', 'Unknown')),
-                            'semester': int(course_data.get('semester', 1)),
-                            'year': int(course_data.get('Year', 1)),
-                            'session_type': str(session_type),
-                            'students_count': int(course_data.get('students_count', 30)),
-                            'block': 'A Block',  # Default block for visualization
-                            'staff_code': f"ST{course_data.get('teacher_id', '1')}"  # Add staff code
-                        }
-
-                        # Add session-specific fields for lab sessions
-                        if session_type == 'lab':
-                            # Map time slot to session name (L1, L2, etc.)
-                            lab_session_map = {
-                                "8:00-10:00": "L1",
-                                "10:10-12:10": "L2",
-                                "1:20-3:20": "L3",
-                                "3:30-5:30": "L4",
-                                "5:40-7:40": "L5",
-                                "7:50-9:50": "L6"
-                            }
-                            entry['session_name'] = lab_session_map.get(time_slot, 'L1')
-                            entry['is_batched'] = False
-                            entry['batch_info'] = ''
-                        else:
-                            # Theory sessions - map to slot index
-                            try:
-                                entry['slot_index'] = self.theory_time_slots.index(time_slot)
-                            except ValueError:
-                                entry['slot_index'] = 0
-
-                        flat_data.append(entry)
-
-        return flat_data
+        # Add session-specific fields for lab sessions
+        if session_type == 'lab':
+            entry['session_name'] = self.LAB_SESSION_MAP.get(time_slot, 'L1')
+            entry['is_batched'] = False
+            entry['batch_info'] = ''
+        else:
+            # Theory sessions - map to slot index
+            entry['slot_index'] = self.theory_slot_index(time_slot)
+
+        return entry
 
     def _generate_visualizations(self):
         """Generate visualizations using the existing visualize.py."""
@@ -646,12 +810,16 @@ class AIScheduler:
             # Generate visualizations using existing function
             visualize_combined_schedule(lab_json_file, theory_json_file, viz_dir)
 
-            self.logger.info(f"✅ Visualizations generated in: {viz_dir}")
+            self.logger.info("Visualizations generated in: %s", viz_dir)
 
         except Exception as e:
-            self.logger.error(f"❌ Visualization failed: {e}")
-            import traceback
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
+            # exception() attaches the traceback only if the record is actually emitted
+            self.logger.exception("Visualization failed: %s", e)
+
+    def wait_for_visualizations(self, timeout=None):
+        """Block until background visualizations (if any) have been written."""
+        if self.visualization_future is not None:
+            self.visualization_future.result(timeout=timeout)
 
     def print_schedule_summary(self):
         """Print a summary of the generated schedule."""
@@ -660,8 +828,8 @@ class AIScheduler:
         print("="*80)
 
         print(f"\n📊 Schedule Statistics:")
-        print(f"  • Lab sessions scheduled: {sum(len(slots.values()) for day_slots in self.lab_schedule.values() for slots in day_slots.values())}")
-        print(f"  • Theory sessions scheduled: {sum(len(slots.values()) for day_slots in self.theory_schedule.values() for slots in day_slots.values())}")
+        print(f"  • Lab sessions scheduled: {self._lab_count}")
+        print(f"  • Theory sessions scheduled: {self._theory_count}")
         print(f"  • Total courses: {len(self.courses_df)}")
         print(f"  • Total rooms: {len(self.rooms_df)}")
 
@@ -680,6 +848,33 @@ class AIScheduler:
         else:
             print(f"\n❌ No valid schedule generated")
 
+def _generate_variation(scheduler_kwargs):
+    """Run one scheduler in a worker process; return its output directory or None."""
+    scheduler = AIScheduler(**scheduler_kwargs)
+    if scheduler.generate_timetable():
+        return scheduler.output_dir
+    return None
+
+def generate_variations(n, **kwargs):
+    """
+    Generate n timetable variations in parallel, one process per seed.
+
+    Keyword arguments are passed to AIScheduler. Seeds run from kwargs['seed']
+    (default 0) upwards, and the CPU cores are split between the processes
+    unless num_search_workers is given.
+
+    Returns:
+        list: Output directories of the variations that were solved
+    """
+    base_seed = kwargs.pop('seed', None) or 0
+    kwargs.setdefault('num_search_workers', max(1, (os.cpu_count() or 1) // n))
+
+    jobs = [dict(kwargs, seed=base_seed + i) for i in range(n)]
+    with ProcessPoolExecutor(max_workers=n) as executor:
+        results = list(executor.map(_generate_variation, jobs))
+
+    return [output_dir for output_dir in results if output_dir]
+
 def main():
     """Main function to demonstrate AI scheduler."""
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
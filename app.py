@@ -7,22 +7,83 @@ Provides endpoints for constraint parsing and timetable generation
 import os
 import json
 import base64
+import hashlib
+import math
+import mmap
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
 
 # Set matplotlib to use non-GUI backend for Flask server
 import matplotlib
 matplotlib.use('Agg')  # Must be set before importing pyplot
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from flask import Flask, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
 from main import parse_time_constraint, time_to_slot_index, parse_time_to_24h
 from ai_scheduler import AIScheduler
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend communication
+try:
+    import orjson
+except ImportError:  # fall back to Flask's stdlib json provider
+    orjson = None
+
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify() through orjson - the responses carry multi-MB base64 image strings"""
+
+    # Same output as the default provider: sorted keys, int slot keys allowed, numpy values
+    OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
 
-# Global state to store current constraint
-current_constraint = None
-current_prompt = ""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app = Flask(__name__)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# Enable CORS for frontend communication. Any origin is allowed with a plain header;
+# set CORS_ORIGINS (comma-separated) to restrict origins through flask_cors instead
+if os.environ.get('CORS_ORIGINS'):
+    from flask_cors import CORS
+    CORS(app, origins=os.environ['CORS_ORIGINS'].split(','))
+else:
+    @app.after_request
+    def add_cors_headers(response):
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, X-Session-ID'
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+        return response
+
+# Prompt/constraint state per client session (session_id in the body or X-Session-ID
+# header; clients that send neither share the "default" session). Idle sessions expire.
+sessions = {}
+sessions_lock = threading.Lock()
+SESSION_TTL_SECONDS = 3600
+
+# The server is threaded so image/health requests are not stuck behind a solve, but
+# solves run one at a time: CP-SAT already uses every core and output directories are
+# named per second (rendering is serialized separately in ai_scheduler)
+generation_lock = threading.Lock()
+
+# Visualization renders still running in the background, keyed by output directory name
+# (entries are removed from the executor's thread when a render finishes)
+pending_visualizations = {}
+pending_visualizations_lock = threading.Lock()
+
+# Solved timetables keyed by constraint fingerprint (LRU, without the base64 image)
+result_cache = OrderedDict()
+RESULT_CACHE_SIZE = 32
+CONSTRAINTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'constraints.py')
+
+# Upper bounds for client solver options: a solve holds generation_lock, so an
+# unbounded time limit would stall every other client
+MAX_SOLVER_WORKERS = os.cpu_count() or 1
+MAX_SOLVE_SECONDS = 300.0  # AIScheduler's default time limit
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -37,9 +98,8 @@ def process_prompt():
     """
     Endpoint 1: Receive prompt from client and generate constraint
     Returns success message after parsing the constraint
+    (Deprecated: /api/schedule parses and generates in one stateless request)
     """
-    global current_constraint, current_prompt
-
     try:
         data = request.get_json()
         prompt = data.get('prompt', '').strip()
@@ -49,51 +109,18 @@ def process_prompt():
                 "error": "No prompt provided"
             }), 400
 
-        # Store the prompt
-        current_prompt = prompt
-
-        # Parse time constraints dynamically
-        time_constraint = parse_time_constraint(prompt)
-
-        if time_constraint:
-            start_time, end_time = time_constraint
-            start_slot = time_to_slot_index(start_time)
-            end_slot = time_to_slot_index(end_time)
-
-            current_constraint = {
-                "type": "time_block",
-                "start_time": start_time,
-                "end_time": end_time,
-                "start_slot": start_slot,
-                "end_slot": end_slot,
-                "blocked_slots": (start_slot, end_slot)
-            }
-
-            response = {
-                "success": True,
-                "message": "Time block constraint generated successfully",
-                "constraint": {
-                    "type": "time_block",
-                    "description": f"Block classes from {start_time:.1f}h to {end_time:.1f}h (slots {start_slot}-{end_slot})",
-                    "start_time": f"{start_time:.1f}h",
-                    "end_time": f"{end_time:.1f}h",
-                    "blocked_slots": f"{start_slot}-{end_slot}"
-                },
-                "prompt": prompt
-            }
-        else:
-            current_constraint = None
-            response = {
-                "success": True,
-                "message": "General scheduling constraint generated successfully",
-                "constraint": {
-                    "type": "general",
-                    "description": "No time restrictions - classes can be scheduled across all available time slots"
-                },
-                "prompt": prompt
-            }
-
-        return jsonify(response)
+        # Parse time constraints dynamically and store them with the prompt
+        constraint, constraint_summary, message = parse_prompt_constraint(prompt)
+        session_id = get_session_id(data)
+        save_session(session_id, prompt, constraint)
+
+        return jsonify({
+            "success": True,
+            "message": message,
+            "constraint": constraint_summary,
+            "prompt": prompt,
+            "session_id": session_id
+        })
 
     except Exception as e:
         return jsonify({
@@ -105,77 +132,104 @@ def generate_timetable():
     """
     Endpoint 2: Generate timetable and return with visualization
     Uses the previously parsed constraint to generate the schedule
+    (Deprecated: use /api/schedule)
     """
-    global current_constraint, current_prompt
-
     try:
+        data = request.get_json(silent=True) or {}
+        current_prompt, current_constraint = load_session(get_session_id(data))
         if not current_prompt:
             return jsonify({
                 "error": "No prompt processed yet. Please call /api/process-prompt first."
             }), 400
 
-        # Create scheduler based on current constraint
-        if current_constraint and current_constraint["type"] == "time_block":
-            scheduler = AIScheduler(
-                block_morning_slots=True,
-                blocked_slots=current_constraint["blocked_slots"]
-            )
-            mode = f"BLOCKED_{current_constraint['start_slot']}_TO_{current_constraint['end_slot']}"
-        else:
-            scheduler = AIScheduler(block_morning_slots=False)
-            mode = "GENERAL"
+        try:
+            solver_options = solver_options_from_request(data)
+        except ValueError as e:
+            return jsonify({
+                "error": str(e)
+            }), 400
 
-        # Generate timetable
-        success = scheduler.generate_timetable()
+        response, status = run_timetable_generation(current_prompt, current_constraint,
+                                                    solver_options=solver_options)
+        return jsonify(response), status
 
-        if not success:
-            return jsonify({
-                "error": "Failed to generate timetable - no feasible solution found"
-            }), 500
+    except Exception as e:
+        return jsonify({
+            "error": f"Failed to generate timetable: {str(e)}"
+        }), 500
 
-        # Analyze the generated timetable
-        analysis = analyze_timetable_results(scheduler.output_dir)
+@app.route('/api/schedule', methods=['POST'])
+def schedule():
+    """
+    Endpoint 5: Parse the prompt and generate the timetable in a single request
+    Stateless - the constraint lives only for this request
+    """
+    try:
+        data = request.get_json() or {}
+        prompt = data.get('prompt', '').strip()
 
-        # Get only the schedule overview image as base64 data
-        schedule_overview_image = get_schedule_overview_image(scheduler.output_dir)
+        if not prompt:
+            return jsonify({
+                "error": "No prompt provided"
+            }), 400
 
-        # Prepare response with schedule overview image
-        response = {
-            "success": True,
-            "message": "Timetable generated successfully",
-            "prompt": current_prompt,
-            "mode": mode,
-            "constraint": current_constraint,
-            "analysis": analysis,
-            "output_directory": scheduler.output_dir,
-            "schedule_overview": schedule_overview_image  # Include only schedule overview image
-        }
+        try:
+            solver_options = solver_options_from_request(data)
+        except ValueError as e:
+            return jsonify({
+                "error": str(e)
+            }), 400
 
-        return jsonify(response)
+        constraint, constraint_summary, _ = parse_prompt_constraint(prompt)
+        response, status = run_timetable_generation(prompt, constraint, wait_for_visualizations=False,
+                                                    solver_options=solver_options)
+        if status == 200:
+            response["constraint_summary"] = constraint_summary
+
+        return jsonify(response), status
 
     except Exception as e:
         return jsonify({
-            "error": f"Failed to generate timetable: {str(e)}"
+            "error": f"Failed to schedule: {str(e)}"
         }), 500
 
 @app.route('/api/get-visualization/<path:filename>', methods=['GET'])
 def get_visualization(filename):
     """
     Endpoint 3: Serve visualization files as base64 encoded images
+    (or as the PNG itself with ?raw=1, streamed with ETag/range support)
     """
     try:
         # Construct full path to visualization file
         viz_path = os.path.join("output", filename)
 
+        # Wait for the file if its timetable is still being rendered in the background
+        with pending_visualizations_lock:
+            render = pending_visualizations.get(filename.split('/', 1)[0])
+        if render is not None and not os.path.exists(viz_path):
+            try:
+                render.result(timeout=120)
+            except FutureTimeoutError:
+                return jsonify({
+                    "success": False,
+                    "status": "pending",
+                    "message": "Visualization is still being rendered, try again shortly"
+                }), 202
+            except Exception as e:
+                return jsonify({
+                    "error": f"Failed to render visualization: {str(e)}"
+                }), 500
+
         if not os.path.exists(viz_path):
             return jsonify({
                 "error": "Visualization file not found"
             }), 404
 
-        # Read and encode image as base64
-        with open(viz_path, 'rb') as f:
-            image_data = f.read()
-            base64_image = base64.b64encode(image_data).decode('utf-8')
+        if request.args.get('raw'):
+            return send_file(os.path.abspath(viz_path), mimetype='image/png', conditional=True)
+
+        # Read and encode image as base64 (cached until the file changes)
+        base64_image = load_encoded_image(viz_path)
 
         return jsonify({
             "success": True,
@@ -194,20 +248,197 @@ def reset_session():
     """
     Endpoint 4: Reset current session (clear constraints and prompt)
     """
-    global current_constraint, current_prompt
-
-    current_constraint = None
-    current_prompt = ""
+    data = request.get_json(silent=True) or {}
+    with sessions_lock:
+        sessions.pop(get_session_id(data), None)
 
     return jsonify({
         "success": True,
         "message": "Session reset successfully"
     })
 
-def analyze_timetable_results(output_dir):
-    """Analyze the generated timetable and return summary statistics"""
-    theory_file = f"{output_dir}/ai_theory_schedule.json"
+def get_session_id(data):
+    """Session of the current request: body session_id, then X-Session-ID header"""
+    return str(data.get('session_id') or request.headers.get('X-Session-ID') or 'default')
+
+def save_session(session_id, prompt, constraint):
+    """Store the parsed prompt for a session, dropping sessions idle past the TTL"""
+    now = time.monotonic()
+    with sessions_lock:
+        for expired_id in [sid for sid, entry in sessions.items() if now - entry["updated"] > SESSION_TTL_SECONDS]:
+            del sessions[expired_id]
+        sessions[session_id] = {"prompt": prompt, "constraint": constraint, "updated": now}
+
+def load_session(session_id):
+    """Return (prompt, constraint) stored for a session, or ("", None)"""
+    with sessions_lock:
+        entry = sessions.get(session_id)
+        if entry is None or time.monotonic() - entry["updated"] > SESSION_TTL_SECONDS:
+            return "", None
+        entry["updated"] = time.monotonic()
+        return entry["prompt"], entry["constraint"]
+
+def parse_prompt_constraint(prompt):
+    """Parse a prompt into (constraint, client-facing constraint summary, message)"""
+    time_constraint = parse_time_constraint(prompt)
+
+    if not time_constraint:
+        return None, {
+            "type": "general",
+            "description": "No time restrictions - classes can be scheduled across all available time slots"
+        }, "General scheduling constraint generated successfully"
+
+    start_time, end_time = time_constraint
+    start_slot = time_to_slot_index(start_time)
+    end_slot = time_to_slot_index(end_time)
+
+    constraint = {
+        "type": "time_block",
+        "start_time": start_time,
+        "end_time": end_time,
+        "start_slot": start_slot,
+        "end_slot": end_slot,
+        "blocked_slots": (start_slot, end_slot)
+    }
+    constraint_summary = {
+        "type": "time_block",
+        "description": f"Block classes from {start_time:.1f}h to {end_time:.1f}h (slots {start_slot}-{end_slot})",
+        "start_time": f"{start_time:.1f}h",
+        "end_time": f"{end_time:.1f}h",
+        "blocked_slots": f"{start_slot}-{end_slot}"
+    }
+    return constraint, constraint_summary, "Time block constraint generated successfully"
+
+def constraint_fingerprint(constraint, solver_options=None):
+    """
+    Hash a parsed constraint together with the (normalized) solver options and the
+    constraints.py version it would be solved with
+    """
+    try:
+        constraints_version = str(os.stat(CONSTRAINTS_FILE).st_mtime_ns)
+    except OSError:
+        constraints_version = ""
+    # A short time limit can return a rushed schedule, so options are part of the key
+    payload = json.dumps([constraint, solver_options or {}], sort_keys=True) + constraints_version
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def solver_options_from_request(data):
+    """
+    Optional CP-SAT tuning from a request body: num_workers and max_time_in_seconds
+    Values are clamped to MAX_SOLVER_WORKERS / MAX_SOLVE_SECONDS; raises ValueError
+    with a client-facing message when a value is not a number
+    """
+    options = {}
+    if data.get('num_workers') is not None:
+        try:
+            workers = int(data['num_workers'])
+        except (TypeError, ValueError):
+            raise ValueError("num_workers must be an integer") from None
+        options['num_search_workers'] = min(max(1, workers), MAX_SOLVER_WORKERS)
+    if data.get('max_time_in_seconds') is not None:
+        try:
+            seconds = float(data['max_time_in_seconds'])
+        except (TypeError, ValueError):
+            raise ValueError("max_time_in_seconds must be a number") from None
+        if not math.isfinite(seconds):
+            raise ValueError("max_time_in_seconds must be a finite number")
+        options['max_time_in_seconds'] = min(max(1.0, seconds), MAX_SOLVE_SECONDS)
+    return options
+
+def run_timetable_generation(prompt, constraint, wait_for_visualizations=True, solver_options=None):
+    """
+    Generate a timetable for a parsed constraint; returns (response dict, HTTP status)
+    Without wait_for_visualizations the response is returned as soon as the solve is done
+    and the overview image is left to /api/get-visualization
+    """
+    solver_options = solver_options or {}
+    key = constraint_fingerprint(constraint, solver_options)
 
+    with generation_lock:
+        result = result_cache.get(key)
+        if result is not None and os.path.isdir(result["output_directory"]):
+            result_cache.move_to_end(key)
+        else:
+            result = solve_timetable(constraint, solver_options)
+            if result is None:
+                return {
+                    "error": "Failed to generate timetable - no feasible solution found"
+                }, 500
+            result_cache[key] = result
+            if len(result_cache) > RESULT_CACHE_SIZE:
+                result_cache.popitem(last=False)
+
+    # Get only the schedule overview image as base64 data
+    output_dir = result["output_directory"]
+    output_name = os.path.basename(output_dir)
+    with pending_visualizations_lock:
+        render = pending_visualizations.get(output_name)
+    if wait_for_visualizations or render is None:
+        if render is not None:
+            render.result()
+        schedule_overview_image = get_schedule_overview_image(output_dir)
+    else:
+        schedule_overview_image = {
+            "filename": OVERVIEW_IMAGE_FILES[0],
+            "url": f"/api/get-visualization/{output_name}/visualizations/{OVERVIEW_IMAGE_FILES[0]}",
+            "content_type": "image/png",
+            "pending": True
+        }
+
+    # Prepare response with schedule overview image
+    return {
+        "success": True,
+        "message": "Timetable generated successfully",
+        "prompt": prompt,
+        "mode": result["mode"],
+        "constraint": constraint,
+        "analysis": result["analysis"],
+        "output_directory": output_dir,
+        "schedule_overview": schedule_overview_image  # Include only schedule overview image
+    }, 200
+
+def forget_pending_visualization(output_name):
+    """Drop a finished render from pending_visualizations (called from the executor's thread)"""
+    with pending_visualizations_lock:
+        pending_visualizations.pop(output_name, None)
+
+def solve_timetable(constraint, solver_options):
+    """Run the scheduler for a constraint; returns the cacheable result or None if infeasible"""
+    # Create scheduler based on the constraint
+    if constraint and constraint["type"] == "time_block":
+        scheduler = AIScheduler(
+            block_morning_slots=True,
+            blocked_slots=constraint["blocked_slots"],
+            **solver_options
+        )
+        mode = f"BLOCKED_{constraint['start_slot']}_TO_{constraint['end_slot']}"
+    else:
+        scheduler = AIScheduler(block_morning_slots=False, **solver_options)
+        mode = "GENERAL"
+
+    # Generate timetable
+    if not scheduler.generate_timetable(async_visualizations=True):
+        return None
+
+    # Track the background render so image requests can wait for it
+    # (none when the scheduler reused its earlier output)
+    output_name = os.path.basename(scheduler.output_dir)
+    render = scheduler.visualization_future
+    if render is not None:
+        with pending_visualizations_lock:
+            pending_visualizations[output_name] = render
+        # Registered outside the lock: the callback runs right here if the render already finished
+        render.add_done_callback(lambda _: forget_pending_visualization(output_name))
+
+    # Analyze the generated timetable
+    return {
+        "mode": mode,
+        "analysis": analyze_timetable_results(scheduler),
+        "output_directory": scheduler.output_dir
+    }
+
+def analyze_timetable_results(scheduler):
+    """Analyze the generated timetable and return summary statistics"""
     analysis = {
         'total_sessions': 0,
         'morning_sessions': 0,  # slots 0-3 (8:00 AM - 12:00 PM)
@@ -216,29 +447,34 @@ def analyze_timetable_results(output_dir):
         'slot_details': {}
     }
 
-    try:
-        with open(theory_file) as f:
-            theory_data = json.load(f)
-
-        analysis['total_sessions'] = len(theory_data)
-        slot_counts = {}
-
-        for session in theory_data:
-            slot = session.get('slot_index', 0)
-            slot_counts[slot] = slot_counts.get(slot, 0) + 1
+    # Count straight from the in-memory schedule instead of re-reading ai_theory_schedule.json
+    slot_counts = Counter()
+    for day_slots in scheduler.theory_schedule.values():
+        for time_slot, assignments in day_slots.items():
+            slot_counts[scheduler.theory_slot_index(time_slot)] += len(assignments)
 
-            if slot <= 3:  # Morning slots (8:00 AM - 12:00 PM)
-                analysis['morning_sessions'] += 1
-            else:  # Afternoon slots (12:10 PM onwards)
-                analysis['afternoon_sessions'] += 1
+    analysis['total_sessions'] = sum(slot_counts.values())
+    # Morning slots 0-3 (8:00 AM - 12:00 PM), afternoon from 12:10 PM onwards
+    analysis['morning_sessions'] = sum(count for slot, count in slot_counts.items() if slot <= 3)
+    analysis['afternoon_sessions'] = analysis['total_sessions'] - analysis['morning_sessions']
+    analysis['time_slots_used'] = sorted(slot_counts)
+    analysis['slot_details'] = dict(slot_counts)
 
-        analysis['time_slots_used'] = sorted(slot_counts.keys())
-        analysis['slot_details'] = slot_counts
+    return analysis
 
-    except Exception as e:
-        print(f"Error analyzing timetable: {e}")
+@lru_cache(maxsize=64)
+def _encode_image(path, mtime_ns, size):
+    """Base64-encode an image; mtime_ns and size are part of the cache key only"""
+    if not size:
+        return ""
+    # Encode straight from the page cache instead of reading a copy of the file first
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as image_data:
+        return base64.b64encode(image_data).decode('utf-8')
 
-    return analysis
+def load_encoded_image(path):
+    """Return the base64 encoding of an image, re-encoding only when the file changed"""
+    st = os.stat(path)
+    return _encode_image(path, st.st_mtime_ns, st.st_size)
 
 def get_visualization_files(output_dir):
     """Get list of available visualization files"""
@@ -246,71 +482,52 @@ def get_visualization_files(output_dir):
     visualizations = {}
 
     if os.path.exists(viz_dir):
-        for filename in os.listdir(viz_dir):
-            if filename.endswith('.png'):
-                # Create relative path for API access
-                relative_path = f"{os.path.basename(output_dir)}/visualizations/{filename}"
-                visualizations[filename.replace('.png', '')] = {
-                    "filename": filename,
-                    "path": relative_path,
-                    "url": f"/api/get-visualization/{relative_path}"
-                }
+        with os.scandir(viz_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.png') and entry.is_file():
+                    # Create relative path for API access
+                    relative_path = f"{os.path.basename(output_dir)}/visualizations/{entry.name}"
+                    visualizations[entry.name.replace('.png', '')] = {
+                        "filename": entry.name,
+                        "path": relative_path,
+                        "url": f"/api/get-visualization/{relative_path}"
+                    }
 
     return visualizations
 
+# Overview image first, combined_analysis.png as the fallback
+OVERVIEW_IMAGE_FILES = ("combined_schedule_overview.png", "combined_analysis.png")
+
 def get_schedule_overview_image(output_dir):
     """Get only the combined_schedule_overview.png image as base64 data"""
     viz_dir = os.path.join(output_dir, "visualizations")
 
-    if not os.path.exists(viz_dir):
-        return None
-
-    # Target the specific file we want
-    target_file = "combined_schedule_overview.png"
-    file_path = os.path.join(viz_dir, target_file)
-
-    if os.path.exists(file_path):
-        try:
-            with open(file_path, 'rb') as f:
-                image_data = f.read()
-                base64_image = base64.b64encode(image_data).decode('utf-8')
-                return {
-                    "filename": target_file,
-                    "image_data": base64_image,
-                    "content_type": "image/png"
-                }
-        except Exception as e:
-            print(f"Error reading {target_file}: {e}")
-            return None
-
-    # If combined_schedule_overview.png doesn't exist, try combined_analysis.png as fallback
-    fallback_file = "combined_analysis.png"
-    fallback_path = os.path.join(viz_dir, fallback_file)
-
-    if os.path.exists(fallback_path):
-        try:
-            with open(fallback_path, 'rb') as f:
-                image_data = f.read()
-                base64_image = base64.b64encode(image_data).decode('utf-8')
+    for filename in OVERVIEW_IMAGE_FILES:
+        file_path = os.path.join(viz_dir, filename)
+        if os.path.exists(file_path):
+            try:
                 return {
-                    "filename": fallback_file,
-                    "image_data": base64_image,
+                    "filename": filename,
+                    "image_data": load_encoded_image(file_path),
                     "content_type": "image/png"
                 }
-        except Exception as e:
-            print(f"Error reading {fallback_file}: {e}")
-            return None
+            except Exception as e:
+                print(f"Error reading {filename}: {e}")
+                return None
 
     return None
 
 if __name__ == '__main__':
     print("🚀 Starting Timetable API Server...")
     print("📡 Endpoints available:")
-    print("   POST /api/process-prompt    - Process constraint prompt")
-    print("   POST /api/generate-timetable - Generate timetable")
+    print("   POST /api/schedule          - Process prompt and generate timetable")
+    print("   POST /api/process-prompt    - Process constraint prompt (deprecated)")
+    print("   POST /api/generate-timetable - Generate timetable (deprecated)")
     print("   GET  /api/get-visualization/<path> - Get visualization image")
     print("   POST /api/reset             - Reset session")
     print("   GET  /api/health            - Health check")
     print()
 
-    app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
+    # Set FLASK_DEBUG=1 for the reloader/debugger; for production run a WSGI server,
+    # e.g. gunicorn -w 4 --threads 4 -b 0.0.0.0:5001 app:app
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5001, threaded=True)
\ No newline at end of file
@@ -5,38 +5,92 @@ Clean Constraints Script
 Removes AI-generated methods with wrong signatures from constraints.py
 """
 
+import ast
+import os
 import re
 
+CONSTRAINTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'constraints.py')
+
+# Methods with wrong signatures (self, model, ...) - the problematic AI-generated methods,
+# keyed by name with the expected arguments after self
+_REMOVE_METHODS = {
+    'apply_max_teaching_hours_constraint': ['model', 'assignment_vars'],
+    'apply_computer_lab_restriction_constraint': ['model', 'lab_variables', 'theory_variables'],
+    'apply_senior_professor_morning_preference': ['model', 'prof_vars', 'time_slots', 'senior_professors'],
+    'apply_evenly_distributed_core_subjects': ['model', 'day_variables', 'course_type'],
+    'apply_first_year_end_time_constraint': ['model', 'time_slots', 'first_year_groups'],
+    'apply_max_teacher_work_hours_constraint': ['model', 'variables', 'teacher_id', 'max_hours'],
+}
+_BLANKLINE_RE = re.compile(r'\n\n\n+')
+# def line of a wrong-signature method, used when constraints.py no longer parses
+_BAD_DEF_RE = re.compile(r'^([ \t]*)def (\w+)\(\s*self\s*,\s*model\b')
+
+def _problematic_line_spans(tree):
+    """Yield (first_line, last_line) of every method matching _REMOVE_METHODS, 1-based"""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and \
+                [arg.arg for arg in node.args.args[1:]] == _REMOVE_METHODS.get(node.name):
+            first_line = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            yield first_line, node.end_lineno
+
+def _indent(line):
+    return len(line) - len(line.lstrip())
+
+def _problematic_line_spans_by_indent(lines):
+    """
+    Fallback for a constraints.py that does not parse (e.g. a broken AI append):
+    yield (first_line, last_line) of every bad method found from its def line,
+    running until the next non-blank line at the def's indentation or less, 1-based
+    """
+    idx = 0
+    while idx < len(lines):
+        match = _BAD_DEF_RE.match(lines[idx])
+        if not match or match.group(2) not in _REMOVE_METHODS:
+            idx += 1
+            continue
+        indent = len(match.group(1))
+        first = idx
+        while first > 0 and lines[first - 1].lstrip().startswith('@') and _indent(lines[first - 1]) == indent:
+            first -= 1
+        end = idx + 1
+        while end < len(lines) and (not lines[end].strip() or _indent(lines[end]) > indent):
+            end += 1
+        # Leave the blank lines after the method in place
+        while end > idx + 1 and not lines[end - 1].strip():
+            end -= 1
+        yield first + 1, end
+        idx = end
+
 def clean_constraints_file():
     """Remove problematic AI-generated constraint methods"""
 
-    with open('/Users/danieldas/Documents/timetable-scheduler/agents/constraints.py', 'r') as f:
+    with open(CONSTRAINTS_FILE, 'r') as f:
         content = f.read()
 
-    # Find and remove methods with wrong signatures (self, model, ...)
-    # These are the problematic AI-generated methods
-    patterns_to_remove = [
-        r'def apply_max_teaching_hours_constraint\(self, model, assignment_vars\):.*?(?=\n    def|\n\n|\Z)',
-        r'def apply_computer_lab_restriction_constraint\(self, model, lab_variables, theory_variables\):.*?(?=\n    def|\n\n|\Z)',
-        r'def apply_senior_professor_morning_preference\(self, model, prof_vars, time_slots, senior_professors\):.*?(?=\n    def|\n\n|\Z)',
-        r'def apply_evenly_distributed_core_subjects\(self, model, day_variables, course_type=\'core\'\):.*?(?=\n    def|\n\n|\Z)',
-        r'def apply_first_year_end_time_constraint\(self, model, time_slots, first_year_groups\):.*?(?=\n    def|\n\n|\Z)',
-        r'def apply_max_teacher_work_hours_constraint\(self, model, variables, teacher_id, max_hours\):.*?(?=\n    def|\n\n|\Z)',
-    ]
+    # One parse finds whole method bodies (nested blocks, blank lines, strings included);
+    # the lines are cut from the source so comments and formatting elsewhere survive
+    lines = content.splitlines(keepends=True)
+    try:
+        spans = list(_problematic_line_spans(ast.parse(content)))
+    except SyntaxError as e:
+        print(f"⚠️ constraints.py does not parse (line {e.lineno}: {e.msg}); "
+              f"locating bad methods by indentation instead")
+        spans = list(_problematic_line_spans_by_indent(lines))
 
-    cleaned_content = content
+    removed = set()
+    for first_line, last_line in spans:
+        removed.update(range(first_line - 1, last_line))
 
-    for pattern in patterns_to_remove:
-        cleaned_content = re.sub(pattern, '', cleaned_content, flags=re.DOTALL)
+    cleaned_content = ''.join(line for idx, line in enumerate(lines) if idx not in removed)
 
     # Remove extra whitespace
-    cleaned_content = re.sub(r'\n\n\n+', '\n\n', cleaned_content)
+    cleaned_content = _BLANKLINE_RE.sub('\n\n', cleaned_content)
 
     # Write cleaned content back
-    with open('/Users/danieldas/Documents/timetable-scheduler/agents/constraints.py', 'w') as f:
+    with open(CONSTRAINTS_FILE, 'w') as f:
         f.write(cleaned_content)
 
-    print("✅ Cleaned constraints.py - removed problematic AI-generated methods")
+    print(f"✅ Cleaned constraints.py - removed {len(spans)} problematic AI-generated methods")
 
 if __name__ == "__main__":
     clean_constraints_file()
\ No newline at end of file
@@ -80,6 +80,7 @@ def test_with_manual_constraint():
 
     # Manually add a constraint (simulating AI generation)
     manual_constraint_code = '''
+    @ai_constraint
     def apply_first_year_end_time_constraint(self, lab_variables, theory_variables):
         """
         Ensure first year students finish classes by 4 PM.
@@ -199,11 +200,8 @@ def test_timetable_generation():
             print("📊 Files generated:")
 
             # List generated files
-            for root, dirs, files in os.walk(scheduler.output_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, scheduler.output_dir)
-                    print(f"  • {relative_path}")
+            for relative_path in iter_output_files(scheduler.output_dir):
+                print(f"  • {relative_path}")
 
             return True
         else:
@@ -216,6 +214,15 @@ def test_timetable_generation():
         traceback.print_exc()
         return False
 
+def iter_output_files(directory, prefix=""):
+    """Yield file paths under directory relative to it (scandir reuses each entry's type info)"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_output_files(entry.path, prefix + entry.name + os.sep)
+            else:
+                yield prefix + entry.name
+
 def main():
     """Main function to run complete system test"""
 
@@ -6,12 +6,72 @@ constraint management system.
 """
 
 import os
+import threading
 from crewai import LLM
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Model catalogue; shared read-only rather than rebuilt per call
+_MODEL_INFO: Mapping[str, Any] = MappingProxyType({
+    'models': MappingProxyType({
+        'gemini-2.5-pro-preview-05-06': {
+            'context_length': '1M tokens',
+            'capabilities': 'Enhanced thinking and reasoning, multimodal understanding, advanced coding',
+            'use_case': 'Complex planning and reasoning tasks',
+            'temperature_range': '0.1-0.5'
+        },
+        'gemini-2.5-flash-preview-04-17': {
+            'context_length': '1M tokens',
+            'capabilities': 'Adaptive thinking, cost efficiency',
+            'use_case': 'Cost-efficient adaptive operations',
+            'temperature_range': '0.4-0.8'
+        },
+        'gemini-2.0-flash': {
+            'context_length': '1M tokens',
+            'capabilities': 'Next generation features, speed, thinking, and realtime streaming',
+            'use_case': 'General purpose balanced performance',
+            'temperature_range': '0.5-0.9'
+        },
+        'gemini-2.0-flash-lite': {
+            'context_length': '1M tokens',
+            'capabilities': 'Cost efficiency and low latency',
+            'use_case': 'High-frequency low-latency operations',
+            'temperature_range': '0.3-0.7'
+        },
+        'gemini-1.5-flash': {
+            'context_length': '1M tokens',
+            'capabilities': 'Balanced multimodal model, good for most tasks',
+            'use_case': 'Fast processing and validation',
+            'temperature_range': '0.4-0.8'
+        },
+        'gemini-1.5-flash-8b': {
+            'context_length': '1M tokens',
+            'capabilities': 'Fastest, most cost-efficient, good for high-frequency tasks',
+            'use_case': 'Monitoring and high-frequency operations',
+            'temperature_range': '0.2-0.6'
+        },
+        'gemini-1.5-pro': {
+            'context_length': '2M tokens',
+            'capabilities': 'Best performing, wide variety of reasoning tasks including logical reasoning, coding, and creative collaboration',
+            'use_case': 'Creative presentation and report generation',
+            'temperature_range': '0.6-1.0'
+        }
+    }),
+    'recommended_usage': MappingProxyType({
+        'constraint_parsing': 'gemini-1.5-flash (fast, accurate)',
+        'constraint_validation': 'gemini-2.0-flash (balanced reasoning)',
+        'schedule_generation': 'gemini-2.5-pro-preview-05-06 (complex optimization)',
+        'presentation_creation': 'gemini-1.5-pro (creative collaboration)',
+        'workflow_planning': 'gemini-2.5-pro-preview-05-06 (advanced planning)',
+        'monitoring': 'gemini-1.5-flash-8b (high-frequency)',
+        'memory_operations': 'gemini-2.5-flash-preview-04-17 (adaptive)'
+    }),
+})
+_MODEL_NAMES = tuple(_MODEL_INFO['models'])
+
 class GeminiConfig:
     """
     Gemini model configuration for different agent roles and use cases.
@@ -23,81 +83,77 @@ class GeminiConfig:
     - gemini-1.5-flash-8B: High-frequency operations
     """
 
+    # Agent role -> getter for its LLM
+    _ROLE_TO_METHOD = {
+        'parser': 'get_fast_processing_llm',
+        'validator': 'get_general_purpose_llm',
+        'generator': 'get_planning_llm',  # Complex optimization needs planning
+        'presenter': 'get_creative_llm',
+        'planner': 'get_planning_llm',
+        'monitor': 'get_high_frequency_llm',
+        'memory': 'get_adaptive_llm'
+    }
+
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
 
         if not self.api_key:
-            print("Debug: Available env vars with 'GEMINI':", [k for k in os.environ.keys() if 'GEMINI' in k])
+            logger.debug("Available env vars with 'GEMINI': %s", [k for k in os.environ if 'GEMINI' in k])
             raise ValueError("GEMINI_API_KEY environment variable must be set")
 
-        print(f"✓ Gemini API key configured (starts with: {self.api_key[:10]}...)")
-        logger.info("Initialized Gemini configuration with API key")
+        # One LLM client per model, reused across agents and constraint runs
+        self._llm_cache: Dict[tuple, LLM] = {}
+
+        logger.info("Initialized Gemini configuration with API key (starts with: %s...)", self.api_key[:10])
+
+    def _cached_llm(self, model: str, temperature: float) -> LLM:
+        """Return the LLM for a model, constructing it on first use only."""
+        llm = self._llm_cache.get((model, temperature))
+        if llm is None:
+            llm = self._llm_cache[(model, temperature)] = LLM(model=model, temperature=temperature, api_key=self.api_key)
+        return llm
 
     def get_planning_llm(self) -> LLM:
         """
         High-performance model for complex planning and reasoning tasks.
         Uses Gemini 2.5 Pro for advanced thinking and reasoning.
         """
-        return LLM(
-            model="gemini/gemini-2.5-pro-preview-05-06",
-            temperature=0.3,  # Lower temperature for consistent planning
-            api_key=self.api_key
-        )
+        return self._cached_llm("gemini/gemini-2.5-pro-preview-05-06", 0.3)  # Lower temperature for consistent planning
 
     def get_general_purpose_llm(self) -> LLM:
         """
         Balanced model for general agent tasks.
         Uses Gemini 2.0 Flash for next-generation features and speed.
         """
-        return LLM(
-            model="gemini/gemini-2.0-flash",
-            temperature=0.7,
-            api_key=self.api_key
-        )
+        return self._cached_llm("gemini/gemini-2.0-flash", 0.7)
 
     def get_fast_processing_llm(self) -> LLM:
         """
         Fast model for quick processing tasks like parsing and validation.
         Uses Gemini 1.5 Flash for balanced performance.
         """
-        return LLM(
-            model="gemini/gemini-1.5-flash",
-            temperature=0.5,
-            api_key=self.api_key
-        )
+        return self._cached_llm("gemini/gemini-1.5-flash", 0.5)
 
     def get_high_frequency_llm(self) -> LLM:
         """
         Efficient model for high-frequency operations and monitoring.
         Uses Gemini 1.5 Flash 8B for cost efficiency.
         """
-        return LLM(
-            model="gemini/gemini-1.5-flash-8b",
-            temperature=0.4,
-            api_key=self.api_key
-        )
+        return self._cached_llm("gemini/gemini-1.5-flash-8b", 0.4)
 
     def get_creative_llm(self) -> LLM:
         """
         Creative model for presentation and report generation.
         Uses Gemini 1.5 Pro for creative collaboration.
         """
-        return LLM(
-            model="gemini/gemini-1.5-pro",
-            temperature=0.8,  # Higher temperature for creativity
-            api_key=self.api_key
-        )
+        return self._cached_llm("gemini/gemini-1.5-pro", 0.8)  # Higher temperature for creativity
 
     def get_adaptive_llm(self) -> LLM:
         """
         Adaptive model for cost-efficient operations.
         Uses Gemini 2.5 Flash Preview for adaptive thinking.
         """
-        return LLM(
-            model="gemini/gemini-2.5-flash-preview-04-17",
-            temperature=0.6,
-            api_key=self.api_key
-        )
+        return self._cached_llm("gemini/gemini-2.5-flash-preview-04-17", 0.6)
 
     def get_llm_for_agent_role(self, role: str) -> LLM:
         """
@@ -109,93 +165,34 @@ class GeminiConfig:
         Returns:
             Configured LLM for the specific role
         """
-        role_mapping = {
-            'parser': self.get_fast_processing_llm,
-            'validator': self.get_general_purpose_llm,
-            'generator': self.get_planning_llm,  # Complex optimization needs planning
-            'presenter': self.get_creative_llm,
-            'planner': self.get_planning_llm,
-            'monitor': self.get_high_frequency_llm,
-            'memory': self.get_adaptive_llm
-        }
-
-        get_llm_func = role_mapping.get(role.lower(), self.get_general_purpose_llm)
-        return get_llm_func()
+        method_name = self._ROLE_TO_METHOD.get(role.lower(), 'get_general_purpose_llm')
+        return getattr(self, method_name)()
 
-    def get_model_info(self) -> Dict[str, Any]:
+    def get_model_info(self) -> Mapping[str, Any]:
         """Get information about available models and their capabilities."""
-        return {
-            'models': {
-                'gemini-2.5-pro-preview-05-06': {
-                    'context_length': '1M tokens',
-                    'capabilities': 'Enhanced thinking and reasoning, multimodal understanding, advanced coding',
-                    'use_case': 'Complex planning and reasoning tasks',
-                    'temperature_range': '0.1-0.5'
-                },
-                'gemini-2.5-flash-preview-04-17': {
-                    'context_length': '1M tokens',
-                    'capabilities': 'Adaptive thinking, cost efficiency',
-                    'use_case': 'Cost-efficient adaptive operations',
-                    'temperature_range': '0.4-0.8'
-                },
-                'gemini-2.0-flash': {
-                    'context_length': '1M tokens',
-                    'capabilities': 'Next generation features, speed, thinking, and realtime streaming',
-                    'use_case': 'General purpose balanced performance',
-                    'temperature_range': '0.5-0.9'
-                },
-                'gemini-2.0-flash-lite': {
-                    'context_length': '1M tokens',
-                    'capabilities': 'Cost efficiency and low latency',
-                    'use_case': 'High-frequency low-latency operations',
-                    'temperature_range': '0.3-0.7'
-                },
-                'gemini-1.5-flash': {
-                    'context_length': '1M tokens',
-                    'capabilities': 'Balanced multimodal model, good for most tasks',
-                    'use_case': 'Fast processing and validation',
-                    'temperature_range': '0.4-0.8'
-                },
-                'gemini-1.5-flash-8b': {
-                    'context_length': '1M tokens',
-                    'capabilities': 'Fastest, most cost-efficient, good for high-frequency tasks',
-                    'use_case': 'Monitoring and high-frequency operations',
-                    'temperature_range': '0.2-0.6'
-                },
-                'gemini-1.5-pro': {
-                    'context_length': '2M tokens',
-                    'capabilities': 'Best performing, wide variety of reasoning tasks including logical reasoning, coding, and creative collaboration',
-                    'use_case': 'Creative presentation and report generation',
-                    'temperature_range': '0.6-1.0'
-                }
-            },
-            'recommended_usage': {
-                'constraint_parsing': 'gemini-1.5-flash (fast, accurate)',
-                'constraint_validation': 'gemini-2.0-flash (balanced reasoning)',
-                'schedule_generation': 'gemini-2.5-pro-preview-05-06 (complex optimization)',
-                'presentation_creation': 'gemini-1.5-pro (creative collaboration)',
-                'workflow_planning': 'gemini-2.5-pro-preview-05-06 (advanced planning)',
-                'monitoring': 'gemini-1.5-flash-8b (high-frequency)',
-                'memory_operations': 'gemini-2.5-flash-preview-04-17 (adaptive)'
-            }
-        }
-
+        return _MODEL_INFO
 
-# Global Gemini configuration instance
+# Global Gemini configuration instance, created exactly once even with concurrent callers
 _gemini_config = None
+_gemini_config_lock = threading.Lock()
 
 def get_gemini_config() -> GeminiConfig:
     """Get global Gemini configuration instance."""
     global _gemini_config
-    if _gemini_config is None:
-        _gemini_config = GeminiConfig()
-    return _gemini_config
+    config = _gemini_config
+    if config is None:
+        with _gemini_config_lock:
+            if _gemini_config is None:
+                _gemini_config = GeminiConfig()
+            config = _gemini_config
+    return config
 
 def set_gemini_api_key(api_key: str):
     """Set Gemini API key and reinitialize configuration."""
     global _gemini_config
-    os.environ['GEMINI_API_KEY'] = api_key
-    _gemini_config = GeminiConfig(api_key)
+    with _gemini_config_lock:
+        os.environ['GEMINI_API_KEY'] = api_key
+        _gemini_config = GeminiConfig(api_key)
 
 def validate_gemini_setup() -> Dict[str, Any]:
     """Validate Gemini API setup and return status."""
@@ -208,7 +205,7 @@ def validate_gemini_setup() -> Dict[str, Any]:
         return {
             'status': 'success',
             'api_key_configured': bool(config.api_key),
-            'models_available': list(config.get_model_info()['models'].keys()),
+            'models_available': list(_MODEL_NAMES),
             'test_model': 'gemini-1.5-flash-8b',
             'message': 'Gemini configuration validated successfully'
         }
@@ -6,11 +6,131 @@ CrewAI agent that generates Python code for new constraints and appends them
 to the existing constraints.py file based on natural language input.
 """
 
+import ast
+import asyncio
+import hashlib
+import logging
 import os
 import re
+import tempfile
+import textwrap
+import threading
+from typing import List, Optional
 from crewai import Agent, Task, Crew, Process
 from config.gemini_config import get_gemini_config
 
+logger = logging.getLogger(__name__)
+
+# constraints.py lives next to this module
+CONSTRAINTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'constraints.py')
+
+# Markdown code fences (```python or bare ```) around LLM output, removed in one pass
+_RE_CODE_FENCE = re.compile(r'```(?:python)?\n?')
+# Constraint method headers in constraints.py (class-level defs only)
+_RE_CONSTRAINT_METHOD = re.compile(r'^    def (apply_\w+\([^)]*\))', re.MULTILINE)
+
+
+def _clock_hour(hour: int) -> int:
+    """Convert a 12-hour clock hour from the 8 AM - 7 PM teaching day to 24-hour"""
+    return hour + 12 if hour < 8 else hour
+
+
+def _no_classes_between_template(match: re.Match) -> str:
+    """Block lab and theory slots that overlap the given hour range"""
+    start, end = _clock_hour(int(match.group(1))), _clock_hour(int(match.group(2)))
+    return f'''def apply_no_classes_between_{start}_and_{end}(self, lab_variables, theory_variables):
+    """Block all classes overlapping {start}:00 to {end}:00."""
+    def slot_minutes(slot):
+        # '12:40 - 1:30' -> (760, 810): 12h labels, the day starts at 8:00 and a slot ends after it starts
+        slot_start, slot_end = ((int(hour) * 60 + int(minute)) for hour, minute in
+                                (part.strip().split(':') for part in slot.split('-')))
+        if slot_start < 8 * 60:
+            slot_start += 12 * 60
+        while slot_end <= slot_start:
+            slot_end += 12 * 60
+        return slot_start, slot_end
+
+    blocked = []
+    for variables, time_slots in ((lab_variables, self.lab_time_slots),
+                                  (theory_variables, self.theory_time_slots)):
+        blocked_slots = set()
+        for idx, slot in enumerate(time_slots):
+            slot_start, slot_end = slot_minutes(slot)
+            if slot_start < {end} * 60 and slot_end > {start} * 60:
+                blocked_slots.add(idx)
+        for course_id, course_vars in variables.items():
+            for day_idx in course_vars:
+                for slot_idx in course_vars[day_idx]:
+                    if slot_idx in blocked_slots:
+                        blocked.extend(course_vars[day_idx][slot_idx].values())
+
+    # Block every collected assignment with one constraint
+    constraints_applied = self._block_assignments(blocked)
+
+    self.logger.info(f"Applied {{constraints_applied}} no_classes_between_{start}_and_{end} constraints")
+    return constraints_applied
+'''
+
+
+def _teacher_weekly_hours_template(match: re.Match) -> str:
+    """Cap each teacher's weekly teaching hours"""
+    max_hours = int(match.group(1))
+    return f'''def apply_teacher_max_{max_hours}_hours_per_week(self, lab_variables, theory_variables):
+    """Limit teachers to maximum {max_hours} hours per week."""
+    from ortools.sat.python import cp_model
+    constraints_applied = 0
+
+    # Lab = 2 hours, theory = 1 hour
+    teacher_sessions = {{}}
+    for variables, hours in ((lab_variables, 2), (theory_variables, 1)):
+        for course_id, course_vars in variables.items():
+            teacher_id = self._teacher_by_course.get(course_id)
+            if teacher_id is None:
+                continue
+            session_vars, session_hours = teacher_sessions.setdefault(teacher_id, ([], []))
+            for day_idx in course_vars:
+                for slot_idx in course_vars[day_idx]:
+                    slot_vars = list(course_vars[day_idx][slot_idx].values())
+                    session_vars.extend(slot_vars)
+                    session_hours.extend([hours] * len(slot_vars))
+
+    for teacher_id, (session_vars, session_hours) in teacher_sessions.items():
+        if session_vars:
+            self.model.Add(cp_model.LinearExpr.WeightedSum(session_vars, session_hours) <= {max_hours})
+            constraints_applied += 1
+
+    self.logger.info(f"Applied {{constraints_applied}} teacher_max_{max_hours}_hours_per_week constraints")
+    return constraints_applied
+'''
+
+
+# Constraints common enough to generate from a template without calling the LLM
+_CONSTRAINT_TEMPLATES = (
+    (re.compile(r'no class(?:es)? during lunch(?: time| break)?(?: between| from)?\s*'
+                r'(\d{1,2})\s*(?:-|to)\s*(\d{1,2})\s*(?:pm)?\.?', re.IGNORECASE),
+     _no_classes_between_template),
+    (re.compile(r'teachers? (?:should|must|can)(?: not|not) (?:work|teach) more than\s*'
+                r'(\d+)\s*hours? (?:per|a|each) week\.?', re.IGNORECASE),
+     _teacher_weekly_hours_template),
+)
+
+# GeminiConfig getter per constraint complexity tier, cheapest model that handles the tier
+_TIER_LLM = {
+    'simple': 'get_high_frequency_llm',
+    'medium': 'get_general_purpose_llm',
+    'complex': 'get_planning_llm',
+}
+# Words that signal an optimization-style constraint rather than a hard rule
+_COMPLEX_KEYWORDS = frozenset({
+    'optimize', 'optimise', 'balance', 'balanced', 'minimize', 'minimise',
+    'maximize', 'maximise', 'evenly', 'distribute', 'prefer', 'preferably', 'spread',
+})
+_RE_WORD = re.compile(r'[a-z]+')
+
+# ASCII status tags for console output
+_TAG_OK = '[OK]'
+_TAG_ERR = '[ERR]'
+
 class ConstraintCodeGenerator:
     """
     CrewAI agent system that generates constraint code and appends it to constraints.py
@@ -18,12 +138,42 @@ class ConstraintCodeGenerator:
 
     def __init__(self):
         self.config = get_gemini_config()
-        self.constraints_file = "/Users/danieldas/Documents/timetable-scheduler/agents/constraints.py"
+        self.constraints_file = CONSTRAINTS_FILE
+        # (pattern, code builder) pairs tried before falling back to the LLM
+        self._templates = list(_CONSTRAINT_TEMPLATES)
+        # Prompt summary of constraints.py, rebuilt after each append
+        self._existing_context = None
+        # Last read of constraints.py and its (mtime, size), reused while the file is unchanged
+        self._last_existing_content = None
+        self._last_existing_stat = None
+        # One agent per complexity tier, built on first use
+        self._agents = {}
+        # Serializes edits to constraints.py and access to the caches above; re-entrant
+        # because append_constraint_to_file re-reads the file while holding it
+        self._file_lock = threading.RLock()
+        # On-disk cache of LLM responses, keyed by constraint, model and existing constraints
+        self.cache_dir = os.getenv(
+            'CONSTRAINT_GEN_CACHE_DIR',
+            os.path.join(os.path.expanduser('~'), '.cache', 'constraint_gen')
+        )
+
+    @staticmethod
+    def _classify_complexity(user_constraint: str) -> str:
+        """Classify a constraint as 'simple', 'medium' or 'complex' for model routing"""
+        words = _RE_WORD.findall(user_constraint.lower())
+        if _COMPLEX_KEYWORDS.intersection(words):
+            return 'complex'
+        return 'simple' if len(words) <= 8 else 'medium'
 
-    def create_code_generator_agent(self):
+    def create_code_generator_agent(self, complexity: str = 'medium'):
+        """Return the CrewAI agent for a complexity tier, creating it once"""
+        with self._file_lock:
+            return self._agents.get(complexity) or self._build_agent(complexity)
+
+    def _build_agent(self, complexity: str):
         """Create CrewAI agent that generates constraint code"""
 
-        llm = self.config.get_general_purpose_llm()
+        llm = getattr(self.config, _TIER_LLM.get(complexity, 'get_general_purpose_llm'))()
 
         agent = Agent(
             role='Constraint Code Generator',
@@ -37,6 +187,7 @@ class ConstraintCodeGenerator:
             llm=llm
         )
 
+        self._agents[complexity] = agent
         return agent
 
     def generate_constraint_code(self, user_constraint: str) -> str:
@@ -50,28 +201,184 @@ class ConstraintCodeGenerator:
             str: Generated Python code for the constraint
         """
 
-        print(f"🤖 Generating code for constraint: '{user_constraint}'")
+        logger.info("Generating code for constraint: '%s'", user_constraint)
+
+        templated_code = self._generate_from_template(user_constraint)
+        if templated_code:
+            return templated_code
+
+        agent = self.create_code_generator_agent(self._classify_complexity(user_constraint))
 
-        agent = self.create_code_generator_agent()
+        cache_path = self._response_cache_path(agent, user_constraint)
+        cached_code = self._load_cached_response(cache_path)
+        if cached_code:
+            return cached_code
 
-        # Read existing constraints.py to understand the current structure
-        existing_code = self._read_existing_constraints()
+        task = self._create_constraint_task(agent, user_constraint)
 
-        task = Task(
+        crew = Crew(
+            agents=[agent],
+            tasks=[task],
+            verbose=True,
+            process=Process.sequential
+        )
+
+        result = crew.kickoff()
+        self._store_cached_response(cache_path, str(result))
+        return str(result)
+
+    def generate_constraints_batch(self, user_constraints: List[str]) -> List[str]:
+        """
+        Generate code for several constraints in a single Crew run
+
+        Args:
+            user_constraints: Natural language constraint descriptions
+
+        Returns:
+            List[str]: Generated code, in the same order as user_constraints
+        """
+
+        if not user_constraints:
+            return []
+
+        logger.info("Generating code for %d constraints", len(user_constraints))
+
+        results = [self._generate_from_template(constraint) for constraint in user_constraints]
+        pending = [i for i, code in enumerate(results) if code is None]
+        if not pending:
+            return results
+
+        # Each task goes to the agent for its tier; agents are shared between tasks
+        tasks = []
+        cache_paths = {}
+        for i in pending:
+            agent = self.create_code_generator_agent(self._classify_complexity(user_constraints[i]))
+            cache_paths[i] = self._response_cache_path(agent, user_constraints[i])
+            results[i] = self._load_cached_response(cache_paths[i])
+            if not results[i]:
+                tasks.append(self._create_constraint_task(agent, user_constraints[i]))
+
+        pending = [i for i in pending if not results[i]]
+        if not pending:
+            return results
+
+        crew = Crew(
+            agents=list({id(task.agent): task.agent for task in tasks}.values()),
+            tasks=tasks,
+            verbose=True,
+            process=Process.sequential
+        )
+
+        result = crew.kickoff()
+        if len(result.tasks_output) != len(pending):
+            # Outputs can't be matched to their constraints, so none of them are used or cached
+            logger.error("Expected %d task outputs, got %d; discarding the batch",
+                         len(pending), len(result.tasks_output))
+            return results
+
+        for i, output in zip(pending, result.tasks_output):
+            results[i] = str(output.raw)
+            self._store_cached_response(cache_paths[i], results[i])
+        return results
+
+    def _response_cache_path(self, agent, user_constraint: str) -> str:
+        """Cache file for a constraint as answered by this agent's model against the current constraints.py"""
+        key = hashlib.blake2b(digest_size=16)
+        for part in (user_constraint.strip(), str(getattr(agent.llm, 'model', '')), self._existing_constraints_context()):
+            key.update(part.encode('utf-8'))
+            key.update(b'\0')
+        return os.path.join(self.cache_dir, key.hexdigest() + '.py')
+
+    def _generated_method_name(self, raw_code: str) -> Optional[str]:
+        """Name of the one apply_*(self, lab_variables, theory_variables) method in generated code, else None"""
+        try:
+            tree = ast.parse(textwrap.dedent(self._clean_generated_code(raw_code)))
+        except SyntaxError:
+            return None
+        methods = [node for node in tree.body
+                   if isinstance(node, ast.FunctionDef) and node.name.startswith('apply_')]
+        if len(methods) != 1:
+            return None
+        if [arg.arg for arg in methods[0].args.args] != ['self', 'lab_variables', 'theory_variables']:
+            return None
+        return methods[0].name
+
+    def _load_cached_response(self, cache_path: str) -> Optional[str]:
+        """Return previously generated code for this cache key, if any; invalid entries are discarded"""
+        try:
+            with open(cache_path, 'r') as f:
+                code = f.read()
+        except OSError:
+            return None
+        if self._generated_method_name(code) is None:
+            logger.warning("Discarding invalid cached code %s", cache_path)
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return None
+        logger.info("Reusing cached code from %s", cache_path)
+        return code
+
+    def _store_cached_response(self, cache_path: str, code: str):
+        """Write generated code to the cache atomically; failures only cost a future LLM call"""
+        if not code:
+            return
+        if self._generated_method_name(code) is None:
+            # Replaying a bad response would fail the same way on every later run
+            logger.warning("Not caching generated code that is not a single valid constraint method")
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(code)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning("Could not cache generated code: %s", e)
+
+    def _generate_from_template(self, user_constraint: str) -> Optional[str]:
+        """Return templated code if the constraint matches a known pattern, else None"""
+        text = user_constraint.strip()
+        for pattern, build_code in self._templates:
+            match = pattern.fullmatch(text)
+            if match:
+                logger.info("Using template %s for constraint: '%s'", build_code.__name__, user_constraint)
+                return build_code(match)
+        return None
+
+    def _create_constraint_task(self, agent, user_constraint: str):
+        """Build the code generation task for one constraint"""
+
+        # Summarize existing constraints.py to understand the current structure
+        existing_code = self._existing_constraints_context()
+
+        return Task(
             description=f"""
             Generate Python code for a new constraint method based on this requirement:
             "{user_constraint}"
 
-            EXISTING CONSTRAINTS.PY STRUCTURE:
-            {existing_code[:2000]}...  # First 2000 chars for context
+            EXISTING CONSTRAINTS.PY STRUCTURE (do not reuse these method names):
+            {existing_code}
 
             CRITICAL REQUIREMENTS:
-            1. Method signature MUST be: def apply_[descriptive_name](self, lab_variables, theory_variables)
+            1. Method signature MUST be: def apply_[descriptive_name](self, lab_variables, theory_variables),
+               decorated with @ai_constraint
             2. NO model parameter - use self.model.Add() instead of model.Add()
+               (for "at most one of these" groups call constraints_applied += self._add_at_most_one(vars),
+               which skips groups the built-in constraints already emitted; to forbid many assignments
+               collect them in a list and call constraints_applied += self._block_assignments(vars)
+               once instead of self.model.Add(var == 0) per variable)
             3. Variables structure: lab_variables[course_id][day_idx][slot_idx][room_id] = BoolVar
             4. Variables structure: theory_variables[course_id][day_idx][slot_idx][room_id] = BoolVar
             5. Access course data via self.courses_df and room data via self.rooms_df
-            6. Use proper iteration patterns shown below
+               (to test a room use self.is_computer_lab(room_id) - never filter rooms_df per room)
+               (for a course's year use self._year_by_course.get(course_id, 1), for its teacher
+               self._teacher_by_course.get(course_id) and for any other column
+               self._course_info[course_id].get('<column>') - never filter courses_df or use .loc per course)
+            6. Use proper iteration patterns shown below, or the cached flat views
+               self._flat(variables) -> [(course_id, day_idx, slot_idx, room_id, var), ...] and
+               self._vars_by_course(variables) -> {{course_id: [var, ...]}}
             7. Always return constraints_applied count
 
             CORRECT VARIABLE ACCESS PATTERN:
@@ -85,6 +392,7 @@ class ConstraintCodeGenerator:
 
             CORRECT METHOD TEMPLATE:
             ```python
+            @ai_constraint
             def apply_descriptive_constraint_name(self, lab_variables, theory_variables):
                 \"\"\"Apply [constraint description]\"\"\"
                 constraints_applied = 0
@@ -94,13 +402,10 @@ class ConstraintCodeGenerator:
                     for day_idx in course_vars:
                         for slot_idx in course_vars[day_idx]:
                             for room_id, var in course_vars[day_idx][slot_idx].items():
-                                # Check if room is computer lab
-                                room_info = self.rooms_df[self.rooms_df['room_id'] == room_id]
-                                if not room_info.empty:
-                                    room_name = room_info.iloc[0].get('room_name', '')
-                                    if 'lab' in room_name.lower() or 'computer' in room_name.lower():
-                                        self.model.Add(var == 0)  # Block this assignment
-                                        constraints_applied += 1
+                                # Check if room is computer lab (precomputed set lookup)
+                                if self.is_computer_lab(room_id):
+                                    self.model.Add(var == 0)  # Block this assignment
+                                    constraints_applied += 1
 
                 self.logger.info(f"Applied {{constraints_applied}} constraint_name constraints")
                 return constraints_applied
@@ -109,24 +414,33 @@ class ConstraintCodeGenerator:
             RETURN ONLY THE PYTHON CODE - NO EXPLANATIONS OR MARKDOWN.
             """,
             agent=agent,
-            expected_output="Complete Python method code for the constraint"
+            expected_output="Complete Python method code for the constraint",
+            # Independent of other tasks: a sequential Crew would otherwise pass every
+            # earlier task's generated code in as context
+            context=[]
         )
 
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            verbose=True,
-            process=Process.sequential
-        )
-
-        result = crew.kickoff()
-        return str(result)
+    def _existing_constraints_context(self) -> str:
+        """Class header plus existing constraint method signatures, cached until the next append"""
+        with self._file_lock:
+            if self._existing_context is None:
+                methods = _RE_CONSTRAINT_METHOD.findall(self._read_existing_constraints())
+                self._existing_context = "class TimetableConstraints:\n" + "\n".join(
+                    f"    def {signature}: ..." for signature in methods
+                )
+            return self._existing_context
 
     def _read_existing_constraints(self) -> str:
-        """Read the current constraints.py file"""
+        """Read the current constraints.py file, reusing the last read if it hasn't changed"""
         try:
-            with open(self.constraints_file, 'r') as f:
-                return f.read()
+            with self._file_lock:
+                st = os.stat(self.constraints_file)
+                file_stat = (st.st_mtime_ns, st.st_size)
+                if file_stat != self._last_existing_stat:
+                    with open(self.constraints_file, 'r') as f:
+                        self._last_existing_content = f.read()
+                    self._last_existing_stat = file_stat
+                return self._last_existing_content
         except FileNotFoundError:
             return "# constraints.py file not found"
 
@@ -143,86 +457,95 @@ class ConstraintCodeGenerator:
         """
 
         try:
-            # Clean up the generated code
-            cleaned_code = self._clean_generated_code(constraint_code)
-
-            # Read existing file
-            existing_content = self._read_existing_constraints()
-
-            # Find the insertion point (before the last line or class end)
-            insertion_point = self._find_insertion_point(existing_content)
-
-            # Create the new content
-            new_content = (
-                existing_content[:insertion_point] +
-                "\n    # AI-Generated Constraint\n" +
-                cleaned_code + "\n\n" +
-                existing_content[insertion_point:]
-            )
-
-            # Write back to file
-            with open(self.constraints_file, 'w') as f:
-                f.write(new_content)
-
-            print(f"✅ Successfully appended constraint '{constraint_name}' to constraints.py")
-            return True
+            # One writer at a time; concurrent pipelines share this generator
+            with self._file_lock:
+                # Clean up the generated code
+                cleaned_code = self._clean_generated_code(constraint_code)
+
+                # Read existing file
+                existing_content = self._read_existing_constraints()
+
+                # A second method with the same name would shadow the first one
+                method_name = self._generated_method_name(constraint_code)
+                if method_name is None:
+                    logger.error("Generated code for '%s' is not a single valid constraint method", constraint_name)
+                    return False
+                if re.search(rf'^    def {method_name}\(', existing_content, re.MULTILINE):
+                    logger.error("Constraint method %s already exists in constraints.py", method_name)
+                    return False
+
+                # Find the insertion point (before the last line or class end)
+                insertion_point = self._find_insertion_point(existing_content)
+
+                new_block = "\n    # AI-Generated Constraint\n" + cleaned_code + "\n\n"
+
+                if insertion_point == len(existing_content):
+                    # Inserting at EOF - just append the new method
+                    with open(self.constraints_file, 'a') as f:
+                        f.write(new_block)
+                else:
+                    # Rewrite only the tail from the insertion point onwards
+                    offset = len(existing_content[:insertion_point].encode('utf-8'))
+                    tail = new_block + existing_content[insertion_point:]
+                    with open(self.constraints_file, 'r+b') as f:
+                        f.seek(offset)
+                        f.write(tail.encode('utf-8'))
+                        f.truncate()
+                self._existing_context = None
+                self._last_existing_stat = None
+
+                logger.info("Appended constraint '%s' to constraints.py", constraint_name)
+                return True
 
         except Exception as e:
-            print(f"❌ Error appending constraint to file: {e}")
+            logger.error("Error appending constraint to file: %s", e)
             return False
 
     def _clean_generated_code(self, raw_code: str) -> str:
         """Clean up the generated code by removing markdown and formatting properly"""
 
         # Remove markdown code blocks
-        code = re.sub(r'```python\n?', '', raw_code)
-        code = re.sub(r'```\n?', '', code)
-
-        # Remove any leading/trailing whitespace
-        code = code.strip()
-
-        # Ensure proper indentation (methods should be indented as class methods)
-        lines = code.split('\n')
-        indented_lines = []
-        for line in lines:
-            if line.strip():  # Non-empty line
-                if not line.startswith('    '):  # Not already indented
-                    indented_lines.append('    ' + line)
-                else:
-                    indented_lines.append(line)
-            else:
-                indented_lines.append(line)
+        code = _RE_CODE_FENCE.sub('', raw_code)
+
+        # Normalize to column 0 and drop surrounding blank lines
+        code = textwrap.dedent(code).strip('\n').rstrip()
+
+        # Register the method so apply_all_constraints runs it
+        if not code.startswith('@ai_constraint'):
+            code = '@ai_constraint\n' + code
+
+        # Indent once as a class method (blank lines stay empty)
+        return textwrap.indent(code, '    ')
 
-        return '\n'.join(indented_lines)
+    @staticmethod
+    def _iter_lines(content: str, start: int = 0):
+        """Yield (offset, line) pairs from start without splitting the whole file into a list"""
+        while start < len(content):
+            end = content.find('\n', start)
+            if end == -1:
+                end = len(content)
+            yield start, content[start:end]
+            start = end + 1
 
     def _find_insertion_point(self, content: str) -> int:
         """Find the best place to insert new constraint code"""
 
-        # Look for the end of the class (before any aliases or end of file)
-        lines = content.split('\n')
-
-        # Find the last method definition or the end of the class
-        last_method_end = -1
-        for i, line in enumerate(lines):
-            if line.strip().startswith('def ') and '    def ' in line:
-                # Find the end of this method
-                method_start = i
-                j = i + 1
-                while j < len(lines):
-                    if (lines[j].strip() and
-                        not lines[j].startswith('    ') and
-                        not lines[j].startswith('\t')):
-                        last_method_end = j
-                        break
-                    j += 1
-
-        if last_method_end > 0:
-            # Insert before the line that ends the last method
-            return len('\n'.join(lines[:last_method_end]))
-        else:
-            # Insert at the end of the file
+        # Jump straight to the last class-level method header
+        last_def = content.rfind('\n    def ')
+        if last_def == -1:
             return len(content)
 
+        # The method ends at the first dedented line after it (an alias, another class, ...)
+        header_end = content.find('\n', last_def + 1)
+        if header_end != -1:
+            for offset, line in self._iter_lines(content, header_end + 1):
+                if line.strip() and not line.startswith(('    ', '\t')):
+                    # Insert ahead of that line's preceding newline
+                    return offset - 1
+
+        # The last method runs to the end of the file
+        return len(content)
+
     def process_user_constraint(self, user_constraint: str) -> bool:
         """
         Complete pipeline: generate code and append to constraints.py
@@ -234,38 +557,67 @@ class ConstraintCodeGenerator:
             bool: True if successful
         """
 
-        print("🚀 Processing User Constraint")
-        print(f"Input: {user_constraint}")
+        logger.info("Processing user constraint: %s", user_constraint)
 
         # Step 1: Generate code
-        print("\n📝 Step 1: Generating constraint code...")
         constraint_code = self.generate_constraint_code(user_constraint)
 
         if not constraint_code:
-            print("❌ Failed to generate constraint code")
+            logger.error("Failed to generate constraint code")
             return False
 
-        print("✅ Constraint code generated")
-        print("Generated code preview:")
-        print("-" * 40)
-        print(constraint_code[:300] + "..." if len(constraint_code) > 300 else constraint_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            preview = constraint_code[:300] + "..." if len(constraint_code) > 300 else constraint_code
+            logger.debug("Generated code preview:\n%s", preview)
 
         # Step 2: Append to file
-        print("\n📄 Step 2: Appending to constraints.py...")
         success = self.append_constraint_to_file(constraint_code, user_constraint)
 
         if success:
-            print(f"\n🎯 SUCCESS: Constraint added to constraints.py!")
-            print(f"   - New constraint method available")
-            print(f"   - File updated with AI-generated code")
-            print(f"   - Ready to use in timetable scheduling")
+            logger.info("Constraint added to constraints.py and ready for scheduling")
 
         return success
 
+    async def process_user_constraint_async(self, user_constraint: str) -> bool:
+        """
+        Async version of process_user_constraint; the LLM call and file write run off the event loop
+
+        Args:
+            user_constraint: Natural language constraint description
+
+        Returns:
+            bool: True if successful
+        """
+        return await asyncio.to_thread(self.process_user_constraint, user_constraint)
+
+    async def process_many(self, user_constraints: List[str], max_concurrency: int = 5) -> List[bool]:
+        """
+        Process several constraints concurrently, overlapping their LLM calls
+
+        Args:
+            user_constraints: Natural language constraint descriptions
+            max_concurrency: Maximum simultaneous Gemini requests
+
+        Returns:
+            List[bool]: Success per constraint, in input order
+        """
+
+        # Read constraints.py once up front so the workers share the cached summary
+        await asyncio.to_thread(self._existing_constraints_context)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def process_one(user_constraint: str) -> bool:
+            async with semaphore:
+                return await self.process_user_constraint_async(user_constraint)
+
+        return list(await asyncio.gather(*(process_one(constraint) for constraint in user_constraints)))
+
 
 def main():
     """Demo the constraint code generation system"""
 
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     generator = ConstraintCodeGenerator()
 
     # Example constraints to test
@@ -275,23 +627,23 @@ def main():
         "No classes during lunch time between 12-1 PM"
     ]
 
-    print("🎯 Constraint Code Generator Demo")
+    print("Constraint Code Generator Demo")
     print("=" * 50)
 
-    for i, constraint in enumerate(test_constraints, 1):
+    # Generate all constraints in one Crew run, then append them one by one
+    generated_code = generator.generate_constraints_batch(test_constraints)
+
+    for i, (constraint, constraint_code) in enumerate(zip(test_constraints, generated_code), 1):
         print(f"\n{'='*60}")
-        print(f"CONSTRAINT {i}")
+        print(f"CONSTRAINT {i}: {constraint}")
         print(f"{'='*60}")
 
-        success = generator.process_user_constraint(constraint)
+        success = bool(constraint_code) and generator.append_constraint_to_file(constraint_code, constraint)
 
         if success:
-            print("✅ Constraint successfully added!")
+            print(f"{_TAG_OK} Constraint successfully added!")
         else:
-            print("❌ Failed to add constraint!")
-
-        if i < len(test_constraints):
-            input("\nPress Enter to continue to next constraint...")
+            print(f"{_TAG_ERR} Failed to add constraint!")
 
 
 if __name__ == "__main__":
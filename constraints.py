@@ -5,10 +5,55 @@ This module contains constraint methods for the timetable scheduling system.
 New constraints can be added dynamically through AI code generation.
 """
 
-import os
-import pandas as pd
+import functools
 import logging
-from ortools.sat.python import cp_model
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Directories searched, in order, for the scheduler's CSV data files
+_DATA_DIRS = ('data', '../data', 'timetable_scheduler/data')
+
+def _file_stamp(path):
+    """(absolute path, mtime_ns, size) for path; changes whenever the file is rewritten"""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+@functools.lru_cache(maxsize=8)
+def _read_csv_cached(path, mtime_ns, size, on_bad_lines='error'):
+    """Parse a CSV once per file version; callers get a shallow copy via _read_csv"""
+    # pandas is imported on first load so importing this module stays cheap
+    import pandas as pd
+    return pd.read_csv(path, on_bad_lines=on_bad_lines)
+
+def _read_csv(path, **kwargs):
+    """Cached pd.read_csv keyed by absolute path and mtime; the copy keeps column edits off the shared frame"""
+    return _read_csv_cached(*_file_stamp(path), **kwargs).copy(deep=False)
+
+@functools.lru_cache(maxsize=4)
+def _teacher_preferences_cached(path, mtime_ns, size):
+    """teacher_id -> {day column: value} parsed from one version of pop.csv"""
+    pop_df = _read_csv_cached(path, mtime_ns, size, on_bad_lines='skip')
+    teacher_preferences = {}
+    if 'teacher_id' in pop_df.columns:
+        # Day columns are the same for every row
+        day_cols = [col for col in pop_df.columns
+                    if 'day' in col.lower() or col.lower() in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']]
+        prefs = pop_df[['teacher_id', *day_cols]].astype({'teacher_id': str})
+        # Later rows win for a repeated teacher_id, and blank ids are skipped
+        prefs = prefs[prefs['teacher_id'] != ''].drop_duplicates('teacher_id', keep='last')
+        teacher_preferences = prefs.set_index('teacher_id').to_dict('index')
+    return teacher_preferences
+
+# Names of AI-generated constraint methods, in definition order
+_AI_CONSTRAINTS = []
+
+def ai_constraint(method):
+    """Register an AI-generated constraint method to be run by apply_all_constraints"""
+    if method.__name__ not in _AI_CONSTRAINTS:
+        _AI_CONSTRAINTS.append(method.__name__)
+    return method
 
 class TimetableConstraints:
     """
@@ -18,6 +63,22 @@ class TimetableConstraints:
     New constraints are added dynamically by the AI constraint generator.
     """
 
+    # Slot limits used by the cell-blocking rules
+    _THEORY_LUNCH_SLOT = 5        # 12:30-1:20
+    _LAB_LUNCH_SLOTS = frozenset({4, 5})  # 11:50-12:40, 12:40-1:30
+    _FIRST_YEAR_CUTOFF_SLOT = 8   # 4:00 PM onwards for first years
+    _LAB_CUTOFF_SLOT = 16         # 5 PM for lab sessions
+
+    # Cell-blocking rules evaluated together by _apply_forbidden_cells
+    _FORBIDDEN_CELL_RULES = ('lunch_break', 'computer_lab_theory', 'first_year_end_time',
+                             'lab_end_before_5pm', 'no_theory_during_lunch')
+
+    # AI-generated constraint methods, filled in by @ai_constraint as the class body runs
+    _ai_registry = _AI_CONSTRAINTS
+
+    # Data files read at construction, relative to a _DATA_DIRS entry
+    DATA_FILES = ('block_wise/techlongue.csv', 'day_order.csv', 'pop.csv', 'core_lab_mapping.csv')
+
     def __init__(self, model, course_file=None, room_file=None, courses_df=None, rooms_df=None):
         """Initialize the constraints with model and data.
 
@@ -35,7 +96,7 @@ class TimetableConstraints:
         if courses_df is not None:
             self.courses_df = courses_df
         elif course_file:
-            self.courses_df = pd.read_csv(course_file)
+            self.courses_df = _read_csv(course_file)
         else:
             raise ValueError("Either courses_df or course_file must be provided")
 
@@ -46,42 +107,84 @@ class TimetableConstraints:
         else:
             raise ValueError("Either rooms_df or room_file must be provided")
 
+        # Per-course metadata looked up inside constraint loops (first row per course_id)
+        first_rows = self.courses_df.drop_duplicates('course_id')
+        if 'Year' in first_rows.columns:
+            self._year_by_course = dict(zip(first_rows['course_id'], first_rows['Year']))
+        else:
+            self._year_by_course = {}
+        # Courses treated as first year (a missing Year counts as first year)
+        self._first_year_courses = frozenset(
+            course_id for course_id in first_rows['course_id']
+            if self._year_by_course.get(course_id, 1) == 1
+        )
+        # Without a teacher_id column every course gets the empty id, like the row-wise .get('teacher_id', '')
+        if 'teacher_id' in first_rows.columns:
+            teacher_ids = first_rows['teacher_id']
+        else:
+            teacher_ids = [''] * len(first_rows)
+        self._teacher_by_course = {
+            course_id: str(teacher_id)
+            for course_id, teacher_id in zip(first_rows['course_id'], teacher_ids)
+        }
+        # Every other column, as course_id -> {column: value}, for lookups without .loc
+        self._course_info = first_rows.set_index('course_id').to_dict('index')
+
+        # Flattened variable views keyed by id() of the nested dict (see _flat, _vars_by_course)
+        self._flat_cache = {}
+        self._by_course_cache = {}
+        # Groups already passed to AddAtMostOne, keyed by the id()s of their variables
+        self._emitted_groups = {}
+
         # Load additional data files from combined_scheduler.py
         self._load_additional_data()
 
         self.logger.info("TimetableConstraints initialized with all data loaded")
 
+    @staticmethod
+    def _resolve_data_path(name):
+        """Return the first existing data/<name> across _DATA_DIRS, or None"""
+        for base in _DATA_DIRS:
+            path = Path(base) / name
+            if path.exists():
+                return path
+        return None
+
+    @classmethod
+    def data_file_stamps(cls):
+        """(path, mtime_ns, size) of each DATA_FILES entry that would be loaded now, None if missing"""
+        stamps = []
+        for name in cls.DATA_FILES:
+            path = cls._resolve_data_path(name)
+            stamps.append(_file_stamp(path) if path else None)
+        return stamps
+
     def _load_room_data(self, room_file):
         """Load room data with techlongue.csv priority (same as combined_scheduler.py)"""
 
         # Try techlongue.csv first (same logic as combined_scheduler.py)
-        techlongue_paths = [
-            'data/block_wise/techlongue.csv',
-            './data/block_wise/techlongue.csv',
-            '../data/block_wise/techlongue.csv',
-            'timetable_scheduler/data/block_wise/techlongue.csv'
-        ]
-
-        for path in techlongue_paths:
-            if os.path.exists(path):
-                self.logger.info(f"Loading room data from techlongue.csv: {path}")
-                return pd.read_csv(path)
+        path = self._resolve_data_path('block_wise/techlongue.csv')
+        if path:
+            self.logger.info(f"Loading room data from techlongue.csv: {path}")
+            return _read_csv(path)
 
         # Fallback to provided room_file
         self.logger.warning(f"techlongue.csv not found, using fallback room file: {room_file}")
-        return pd.read_csv(room_file)
+        return _read_csv(room_file)
 
     def _load_additional_data(self):
         """Load additional data files used by combined_scheduler.py"""
 
-        # Load day order information
-        self.day_order_df = self._load_day_order()
-
-        # Load teacher day preferences from pop.csv
-        self.teacher_day_preferences = self._load_teacher_day_preferences()
-
-        # Load core lab mapping
-        self.core_mapping_df = self._load_core_mapping()
+        # Day order, teacher day preferences (pop.csv) and core lab mapping are
+        # independent CSV reads, so let their I/O and parsing overlap
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            day_order = pool.submit(self._load_day_order)
+            preferences = pool.submit(self._load_teacher_day_preferences)
+            core_mapping = pool.submit(self._load_core_mapping)
+            self.day_order_df = day_order.result()
+            self.teacher_day_preferences = preferences.result()
+            self.core_mapping_df = core_mapping.result()
+        self._build_dept_day_index()
 
         # Set up time slot configurations
         self._setup_time_slots()
@@ -92,19 +195,12 @@ class TimetableConstraints:
     def _load_day_order(self):
         """Load day order information from day_order.csv (same as combined_scheduler.py)"""
         try:
-            day_order_paths = [
-                'data/day_order.csv',
-                './data/day_order.csv',
-                '../data/day_order.csv',
-                'timetable_scheduler/data/day_order.csv'
-            ]
-
-            for path in day_order_paths:
-                if os.path.exists(path):
-                    day_order_df = pd.read_csv(path)
-                    self.logger.info(f"Loaded day order information from {path}")
-                    self.logger.info(f"Found {len(day_order_df)} department entries")
-                    return day_order_df
+            path = self._resolve_data_path('day_order.csv')
+            if path:
+                day_order_df = _read_csv(path)
+                self.logger.info(f"Loaded day order information from {path}")
+                self.logger.info(f"Found {len(day_order_df)} department entries")
+                return day_order_df
 
             self.logger.warning("day_order.csv not found. Using default Monday-Friday schedule.")
             return None
@@ -115,39 +211,18 @@ class TimetableConstraints:
 
     def _load_teacher_day_preferences(self):
         """Load teacher day preferences from pop.csv (same as combined_scheduler.py)"""
-        teacher_preferences = {}
-
         try:
-            pop_file_paths = [
-                'data/pop.csv',
-                './data/pop.csv',
-                '../data/pop.csv',
-                'timetable_scheduler/data/pop.csv'
-            ]
-
-            for path in pop_file_paths:
-                if os.path.exists(path):
-                    try:
-                        # Try to read with error handling for inconsistent columns
-                        pop_df = pd.read_csv(path, on_bad_lines='skip')
-                        self.logger.info(f"Loaded teacher day preferences from {path}")
-
-                        # Process preferences (simplified version)
-                        for _, row in pop_df.iterrows():
-                            teacher_id = str(row.get('teacher_id', ''))
-                            if teacher_id:
-                                # Extract preferred days from row data
-                                preferences = {}
-                                for col in pop_df.columns:
-                                    if 'day' in col.lower() or col.lower() in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']:
-                                        preferences[col] = row.get(col, 0)
-                                teacher_preferences[teacher_id] = preferences
-
-                        self.logger.info(f"Processed preferences for {len(teacher_preferences)} teachers")
-                        return teacher_preferences
-                    except Exception as csv_error:
-                        self.logger.warning(f"Error reading {path}: {csv_error}")
-                        continue
+            path = self._resolve_data_path('pop.csv')
+            if path:
+                try:
+                    # Try to read with error handling for inconsistent columns; parsed once per file version
+                    teacher_preferences = dict(_teacher_preferences_cached(*_file_stamp(path)))
+                    self.logger.info(f"Loaded teacher day preferences from {path}")
+                    self.logger.info(f"Processed preferences for {len(teacher_preferences)} teachers")
+                    return teacher_preferences
+                except Exception as csv_error:
+                    self.logger.warning(f"Error reading {path}: {csv_error}")
+                    return {}
 
             self.logger.warning("pop.csv not found. No teacher day preferences will be applied.")
             return {}
@@ -159,19 +234,12 @@ class TimetableConstraints:
     def _load_core_mapping(self):
         """Load core lab mapping data"""
         try:
-            core_mapping_paths = [
-                'data/core_lab_mapping.csv',
-                './data/core_lab_mapping.csv',
-                '../data/core_lab_mapping.csv',
-                'timetable_scheduler/data/core_lab_mapping.csv'
-            ]
-
-            for path in core_mapping_paths:
-                if os.path.exists(path):
-                    core_mapping_df = pd.read_csv(path)
-                    self.logger.info(f"Loaded core lab mapping from {path}")
-                    self.logger.info(f"Core mapping contains {len(core_mapping_df)} course-lab assignments")
-                    return core_mapping_df
+            path = self._resolve_data_path('core_lab_mapping.csv')
+            if path:
+                core_mapping_df = _read_csv(path)
+                self.logger.info(f"Loaded core lab mapping from {path}")
+                self.logger.info(f"Core mapping contains {len(core_mapping_df)} course-lab assignments")
+                return core_mapping_df
 
             self.logger.warning("core_lab_mapping.csv not found. No core lab constraints will be applied.")
             return None
@@ -206,65 +274,80 @@ class TimetableConstraints:
         """Set up department-specific configurations"""
 
         # Default working days
-        self.days = ["monday", "tuesday", "wed", "thur", "fri"]
+        self.days = ("monday", "tuesday", "wed", "thur", "fri")
         self.num_days = len(self.days)
 
         # Lunch break configuration
         self.lunch_break_config = {
-            'default_slot': 5,  # 12:30-1:20 for theory
+            'default_slot': self._THEORY_LUNCH_SLOT,  # 12:30-1:20 for theory
             'flexible_departments': ['Electronics & Communication Engineering'],
             'strict_departments': ['Computer Science & Engineering', 'Mechanical Engineering']
         }
 
         # Room type mappings
+        self.computer_lab_ids = frozenset()
         if hasattr(self, 'rooms_df') and not self.rooms_df.empty:
-            # Extract room type information
-            self.lab_room_ids = []
-            self.theory_room_ids = []
+            # Extract room type information with one vectorized pass over the name column
+            import pandas as pd
+            rooms = self.rooms_df
+            name_col = next((c for c in ('room_name', 'name') if c in rooms.columns), None)
+            id_col = next((c for c in ('room_id', 'id') if c in rooms.columns), None)
+            names = rooms[name_col].astype(str) if name_col else pd.Series('', index=rooms.index)
+            room_ids = rooms[id_col] if id_col else pd.Series('', index=rooms.index)
 
-            for _, room in self.rooms_df.iterrows():
-                room_name = str(room.get('room_name', room.get('name', ''))).lower()
-                room_id = room.get('room_id', room.get('id', ''))
+            is_lab = names.str.lower().str.contains('lab|computer', regex=True).to_numpy()
+            self.lab_room_ids = room_ids[is_lab].tolist()
+            self.theory_room_ids = room_ids[~is_lab].tolist()
 
-                if 'lab' in room_name or 'computer' in room_name:
-                    self.lab_room_ids.append(room_id)
-                else:
-                    self.theory_room_ids.append(room_id)
+            # Constant-time lookups for is_computer_lab and the computer lab restriction
+            self.computer_lab_ids = frozenset(self.lab_room_ids)
 
             self.logger.info(f"Categorized {len(self.lab_room_ids)} lab rooms and {len(self.theory_room_ids)} theory rooms")
 
+    def _build_dept_day_index(self):
+        """Flatten day_order_df into (lowercased department, semester, row) tuples once"""
+        self._dept_day_index = []
+        self._dept_day_lookup = {}
+        if self.day_order_df is None:
+            return
+
+        columns = self.day_order_df.columns
+        # Try different possible column names for department and semester
+        dept_column = next((c for c in ['department', 'Department', 'dept', 'Dept'] if c in columns), None)
+        sem_column = next((c for c in ['semester', 'Semester', 'sem', 'Sem'] if c in columns), None)
+        if dept_column is None or sem_column is None:
+            # Without both columns no department-specific entry can match
+            return
+
+        import pandas as pd
+        for row in self.day_order_df.to_dict('records'):
+            dept = row[dept_column]
+            if pd.isna(dept):
+                continue
+            self._dept_day_index.append((str(dept).lower(), row[sem_column], row))
+
     def get_department_working_days(self, department, semester=None):
         """Get working days for a specific department"""
-        if self.day_order_df is not None:
-            try:
-                # Try different possible column names for department
-                dept_column = None
-                for col in ['department', 'Department', 'dept', 'Dept']:
-                    if col in self.day_order_df.columns:
-                        dept_column = col
-                        break
-
-                if dept_column:
-                    # Try to find department-specific day configuration
-                    dept_config = self.day_order_df[
-                        self.day_order_df[dept_column].str.contains(department, case=False, na=False)
-                    ]
-
-                    if not dept_config.empty and semester:
-                        # Further filter by semester if provided
-                        sem_column = None
-                        for col in ['semester', 'Semester', 'sem', 'Sem']:
-                            if col in self.day_order_df.columns:
-                                sem_column = col
-                                break
-
-                        if sem_column:
-                            sem_config = dept_config[dept_config[sem_column] == semester]
-                            if not sem_config.empty:
-                                return sem_config.iloc[0].get('working_days', self.days)
+        if not self._dept_day_index or not semester:
+            # Default to standard working days
+            return self.days
 
-            except Exception as e:
-                self.logger.warning(f"Error processing department working days: {e}")
+        key = (str(department).lower(), semester)
+        try:
+            if key not in self._dept_day_lookup:
+                dept_key = key[0]
+                # First department entry containing the name for this semester
+                row = next(
+                    (r for dept, sem, r in self._dept_day_index
+                     if dept_key in dept and sem == semester),
+                    None
+                )
+                self._dept_day_lookup[key] = row
+            row = self._dept_day_lookup[key]
+            if row is not None:
+                return row.get('working_days', self.days)
+        except Exception as e:
+            self.logger.warning(f"Error processing department working days: {e}")
 
         # Default to standard working days
         return self.days
@@ -272,25 +355,120 @@ class TimetableConstraints:
     def is_lunch_time_slot(self, slot_index, slot_type='theory'):
         """Check if a given slot index is during lunch time"""
         if slot_type == 'theory':
-            return slot_index == self.lunch_break_config['default_slot']
-        elif slot_type == 'lab':
-            # For labs, lunch time might span multiple slots
-            return slot_index in [4, 5]  # 11:50-12:40, 12:40-1:30
+            return slot_index == self._THEORY_LUNCH_SLOT
+        if slot_type == 'lab':
+            # For labs, lunch time spans two slots
+            return slot_index in self._LAB_LUNCH_SLOTS
         return False
 
     def is_computer_lab(self, room_id):
         """Check if a room is a computer lab"""
-        if hasattr(self, 'rooms_df') and not self.rooms_df.empty:
-            room_info = self.rooms_df[
-                (self.rooms_df['room_id'] == room_id) |
-                (self.rooms_df.get('id') == room_id)
-            ]
+        return room_id in self.computer_lab_ids
 
-            if not room_info.empty:
-                room_name = str(room_info.iloc[0].get('room_name', room_info.iloc[0].get('name', ''))).lower()
-                return 'computer' in room_name or 'lab' in room_name
+    def _apply_forbidden_cells(self, lab_variables, theory_variables, rules=None):
+        """Block the cells forbidden by several rules in a single pass over the variables.
 
-        return False
+        Args:
+            lab_variables: Lab assignment variables
+            theory_variables: Theory assignment variables
+            rules: Names from _FORBIDDEN_CELL_RULES to apply (default: all of them)
+
+        Returns:
+            dict: Rule name -> number of assignments it blocked
+        """
+        counts = dict.fromkeys(self._FORBIDDEN_CELL_RULES if rules is None else rules, 0)
+        blocked = {}  # var index -> var, so a cell hit by several rules is blocked once
+
+        lunch_rules = [rule for rule in ('lunch_break', 'no_theory_during_lunch') if rule in counts]
+        lab_rooms = self.computer_lab_ids if 'computer_lab_theory' in counts else ()
+
+        for course_id, day_idx, slot_idx, room_id, var in self._flat(theory_variables):
+            if slot_idx == self._THEORY_LUNCH_SLOT and lunch_rules:
+                for rule in lunch_rules:
+                    counts[rule] += 1
+                blocked[var.Index()] = var
+            if room_id in lab_rooms:
+                # Block theory course from computer lab
+                counts['computer_lab_theory'] += 1
+                blocked[var.Index()] = var
+
+        if 'first_year_end_time' in counts:
+            # Only first-year courses, and only their slots after the cutoff
+            for course_id, course_vars in theory_variables.items():
+                if course_id not in self._first_year_courses:
+                    continue
+                for day_vars in course_vars.values():
+                    for slot_idx, slot_vars in day_vars.items():
+                        if slot_idx >= self._FIRST_YEAR_CUTOFF_SLOT:
+                            counts['first_year_end_time'] += len(slot_vars)
+                            for var in slot_vars.values():
+                                blocked[var.Index()] = var
+
+        if 'lab_end_before_5pm' in counts:
+            for course_id, day_idx, slot_idx, room_id, var in self._flat(lab_variables):
+                if slot_idx >= self._LAB_CUTOFF_SLOT:
+                    counts['lab_end_before_5pm'] += 1
+                    blocked[var.Index()] = var
+
+        self._block_assignments(list(blocked.values()))
+        return counts
+
+    def _flat(self, variables):
+        """Flat (course_id, day_idx, slot_idx, room_id, var) list for a nested variable dict.
+
+        Built once per dict and shared by every constraint pass; the variable dicts are not
+        modified after creation.
+        """
+        cached = self._flat_cache.get(id(variables))
+        if cached is None or cached[0] is not variables:
+            flat = [
+                (course_id, day_idx, slot_idx, room_id, var)
+                for course_id, course_vars in variables.items()
+                for day_idx, day_vars in course_vars.items()
+                for slot_idx, slot_vars in day_vars.items()
+                for room_id, var in slot_vars.items()
+            ]
+            cached = self._flat_cache[id(variables)] = (variables, flat)
+        return cached[1]
+
+    def _vars_by_course(self, variables):
+        """course_id -> list of all its assignment variables, cached alongside _flat"""
+        cached = self._by_course_cache.get(id(variables))
+        if cached is None or cached[0] is not variables:
+            by_course = {
+                course_id: [var for day_vars in course_vars.values()
+                            for slot_vars in day_vars.values()
+                            for var in slot_vars.values()]
+                for course_id, course_vars in variables.items()
+            }
+            cached = self._by_course_cache[id(variables)] = (variables, by_course)
+        return cached[1]
+
+    def _add_at_most_one(self, variables):
+        """AddAtMostOne over variables unless the same set was already constrained.
+
+        Returns 1 if a constraint was added, 0 if it would have duplicated an earlier one.
+        """
+        # Storing the group keeps its variables alive, so their ids cannot be reused
+        key = frozenset(map(id, variables))
+        if key in self._emitted_groups:
+            return 0
+        self._emitted_groups[key] = variables
+        self.model.AddAtMostOne(variables)
+        return 1
+
+    def _block_assignments(self, blocked):
+        """Forbid every assignment variable in blocked with a single constraint.
+
+        Presolve fixes each of these literals to false, which propagates at
+        least as strongly as an AddAllowedAssignments table over channelled
+        (day, slot, room) integers would, without the extra variables.
+
+        Returns the number of assignments blocked.
+        """
+        if blocked:
+            self.model.AddBoolAnd([var.Not() for var in blocked])
+        return len(blocked)
 
     def apply_all_constraints(self, lab_variables, theory_variables):
         """
@@ -308,16 +486,10 @@ class TimetableConstraints:
 
         # Apply basic constraints
         # Add basic scheduling constraints to ensure courses get scheduled
-        for course_id, course_vars in theory_variables.items():
-            course_assignments = []
-            for day_idx in course_vars:
-                for slot_idx in course_vars[day_idx]:
-                    for room_id, var in course_vars[day_idx][slot_idx].items():
-                        course_assignments.append(var)
-
+        for course_id, course_assignments in self._vars_by_course(theory_variables).items():
             if course_assignments:
                 # Each course must be scheduled at least once
-                self.model.Add(sum(course_assignments) >= 1)
+                self.model.AddBoolOr(course_assignments)
                 total_constraints += 1
 
         total_constraints += self.apply_basic_scheduling_constraints(lab_variables, theory_variables)
@@ -325,27 +497,22 @@ class TimetableConstraints:
         # Apply migrated constraints from src/combined_scheduler.py (minimal set for stability)
         self.logger.info("Applying migrated constraints from combined_scheduler.py...")
 
-        total_constraints += self.apply_lunch_break_constraint(lab_variables, theory_variables)
+        # Lunch break, computer lab, first year, lab cutoff and lunch theory blocks in one pass
+        forbidden_counts = self._apply_forbidden_cells(lab_variables, theory_variables)
+        self.logger.info(f"Blocked forbidden cells: {forbidden_counts}")
+        total_constraints += sum(forbidden_counts.values())
         total_constraints += self.apply_lab_room_single_assignment_constraint(lab_variables, theory_variables)
         total_constraints += self.apply_teacher_clash_prevention_constraint(lab_variables, theory_variables)
 
         # Apply AI-generated constraints when available
         self.logger.info("Applying AI-generated constraints...")
 
-        # Find and call all AI-generated constraint methods
-        ai_methods = [method for method in dir(self)
-                     if method.startswith('apply_') and
-                     method not in ['apply_all_constraints', 'apply_basic_scheduling_constraints'] and
-                     method not in ['apply_lunch_break_constraint', 'apply_lab_room_single_assignment_constraint',
-                                   'apply_teacher_clash_prevention_constraint']]
-
-        for method_name in ai_methods:
+        # Call the registered AI-generated constraint methods
+        for method_name in self._ai_registry:
             try:
-                method = getattr(self, method_name)
-                if callable(method):
-                    constraints_added = method(lab_variables, theory_variables)
-                    total_constraints += constraints_added
-                    self.logger.info(f"Applied {constraints_added} constraints via {method_name}")
+                constraints_added = getattr(self, method_name)(lab_variables, theory_variables)
+                total_constraints += constraints_added
+                self.logger.info(f"Applied {constraints_added} constraints via {method_name}")
             except Exception as e:
                 self.logger.error(f"Error applying {method_name}: {e}")
 
@@ -367,18 +534,11 @@ class TimetableConstraints:
         Prevent scheduling in lunch break time slots.
         Migrated from src/combined_scheduler.py
         """
-        constraints_applied = 0
         self.logger.info("Applying lunch break constraints...")
 
         # Block lunch break slot for theory sessions (slot 5: 12:30-1:20)
-        lunch_slot = 5
-
-        for course_id, course_vars in theory_variables.items():
-            for day_idx in course_vars:
-                if lunch_slot in course_vars[day_idx]:
-                    for room_id, var in course_vars[day_idx][lunch_slot].items():
-                        self.model.Add(var == 0)
-                        constraints_applied += 1
+        constraints_applied = self._apply_forbidden_cells(
+            lab_variables, theory_variables, ('lunch_break',))['lunch_break']
 
         self.logger.info(f"Applied {constraints_applied} lunch break constraints")
         return constraints_applied
@@ -392,34 +552,18 @@ class TimetableConstraints:
         self.logger.info("Applying lab room single assignment constraint...")
 
         # Track room assignments by time slot
-        room_slot_assignments = {}
-
-        # Process lab variables
-        for course_id, course_vars in lab_variables.items():
-            for day_idx in course_vars:
-                for slot_idx in course_vars[day_idx]:
-                    for room_id, var in course_vars[day_idx][slot_idx].items():
-                        key = (room_id, day_idx, slot_idx)
-                        if key not in room_slot_assignments:
-                            room_slot_assignments[key] = []
-                        room_slot_assignments[key].append(var)
-
-        # Process theory variables
-        for course_id, course_vars in theory_variables.items():
-            for day_idx in course_vars:
-                for slot_idx in course_vars[day_idx]:
-                    for room_id, var in course_vars[day_idx][slot_idx].items():
-                        key = (room_id, day_idx, slot_idx)
-                        if key not in room_slot_assignments:
-                            room_slot_assignments[key] = []
-                        room_slot_assignments[key].append(var)
+        room_slot_assignments = defaultdict(list)
+
+        # Process lab variables, then theory variables
+        for variables in (lab_variables, theory_variables):
+            for course_id, day_idx, slot_idx, room_id, var in self._flat(variables):
+                room_slot_assignments[(room_id, day_idx, slot_idx)].append(var)
 
         # Apply single assignment constraint for each room-time combination
         for (room_id, day_idx, slot_idx), variables in room_slot_assignments.items():
             if len(variables) > 1:
                 # Only one assignment allowed per room per time slot
-                self.model.Add(sum(variables) <= 1)
-                constraints_applied += 1
+                constraints_applied += self._add_at_most_one(variables)
 
         self.logger.info(f"Applied {constraints_applied} lab room single assignment constraints")
         return constraints_applied
@@ -433,44 +577,25 @@ class TimetableConstraints:
         self.logger.info("Applying teacher clash prevention constraint...")
 
         # Collect all assignments by teacher and time
-        teacher_time_assignments = {}  # (teacher_id, day, slot) -> list of variables
-
-        # Process theory variables
-        for course_id, course_vars in theory_variables.items():
-            # Get teacher for this course
-            if hasattr(self, 'courses_df'):
-                course_info = self.courses_df[self.courses_df['course_id'] == course_id]
-                if not course_info.empty:
-                    teacher_id = str(course_info.iloc[0].get('teacher_id', ''))
-                    for day_idx in course_vars:
-                        for slot_idx in course_vars[day_idx]:
-                            for room_id, var in course_vars[day_idx][slot_idx].items():
-                                key = (teacher_id, day_idx, slot_idx)
-                                if key not in teacher_time_assignments:
-                                    teacher_time_assignments[key] = []
-                                teacher_time_assignments[key].append(var)
-
-        # Process lab variables
-        for course_id, course_vars in lab_variables.items():
-            # Get teacher for this course
-            if hasattr(self, 'courses_df'):
-                course_info = self.courses_df[self.courses_df['course_id'] == course_id]
-                if not course_info.empty:
-                    teacher_id = str(course_info.iloc[0].get('teacher_id', ''))
-                    for day_idx in course_vars:
-                        for slot_idx in course_vars[day_idx]:
-                            for room_id, var in course_vars[day_idx][slot_idx].items():
-                                key = (teacher_id, day_idx, slot_idx)
-                                if key not in teacher_time_assignments:
-                                    teacher_time_assignments[key] = []
-                                teacher_time_assignments[key].append(var)
+        teacher_time_assignments = defaultdict(list)  # (teacher_id, day, slot) -> list of variables
+
+        # Process theory variables, then lab variables
+        for variables in (theory_variables, lab_variables):
+            for course_id, course_vars in variables.items():
+                # Get teacher for this course
+                teacher_id = self._teacher_by_course.get(course_id)
+                if teacher_id is None:
+                    continue
+                # Every room of a (day, slot) shares the same key, so add them together
+                for day_idx, day_vars in course_vars.items():
+                    for slot_idx, slot_vars in day_vars.items():
+                        teacher_time_assignments[(teacher_id, day_idx, slot_idx)].extend(slot_vars.values())
 
         # Apply clash prevention constraint
         for (teacher_id, day_idx, slot_idx), variables in teacher_time_assignments.items():
             if len(variables) > 1:
                 # Teacher can only be assigned to one session per time slot
-                self.model.Add(sum(variables) <= 1)
-                constraints_applied += 1
+                constraints_applied += self._add_at_most_one(variables)
 
         self.logger.info(f"Applied {constraints_applied} teacher clash prevention constraints")
         return constraints_applied
@@ -484,22 +609,8 @@ class TimetableConstraints:
         Prevent theory courses from being scheduled in computer labs.
         Computer labs should be reserved for practical sessions only.
         """
-        constraints_applied = 0
-
-        # Process theory variables to block computer lab assignments
-        for course_id, course_vars in theory_variables.items():
-            for day_idx in course_vars:
-                for slot_idx in course_vars[day_idx]:
-                    for room_id, var in course_vars[day_idx][slot_idx].items():
-                        # Check if room is a computer lab
-                        if hasattr(self, 'rooms_df'):
-                            room_info = self.rooms_df[self.rooms_df['room_id'] == room_id]
-                            if not room_info.empty:
-                                room_name = str(room_info.iloc[0].get('room_name', '')).lower()
-                                if 'computer' in room_name or 'lab' in room_name:
-                                    # Block theory course from computer lab
-                                    self.model.Add(var == 0)
-                                    constraints_applied += 1
+        constraints_applied = self._apply_forbidden_cells(
+            lab_variables, theory_variables, ('computer_lab_theory',))['computer_lab_theory']
 
         self.logger.info(f"Applied {constraints_applied} computer lab theory restriction constraints")
         return constraints_applied
@@ -508,24 +619,8 @@ class TimetableConstraints:
         Ensure first year students finish classes by 4 PM.
         First year students should not have classes after 4 PM to allow for other activities.
         """
-        constraints_applied = 0
-
-        # Define 4 PM cutoff (theory slot index for 4:00-4:50)
-        afternoon_cutoff = 8  # Slots after 4 PM
-
-        # Process theory variables for first year courses
-        for course_id, course_vars in theory_variables.items():
-            if hasattr(self, 'courses_df'):
-                course_info = self.courses_df[self.courses_df['course_id'] == course_id]
-                if not course_info.empty:
-                    year = course_info.iloc[0].get('Year', 1)
-                    if year == 1:  # First year students
-                        for day_idx in course_vars:
-                            for slot_idx in course_vars[day_idx]:
-                                if slot_idx >= afternoon_cutoff:  # After 4 PM
-                                    for room_id, var in course_vars[day_idx][slot_idx].items():
-                                        self.model.Add(var == 0)
-                                        constraints_applied += 1
+        constraints_applied = self._apply_forbidden_cells(
+            lab_variables, theory_variables, ('first_year_end_time',))['first_year_end_time']
 
         self.logger.info(f"Applied {constraints_applied} first year end time constraints")
         return constraints_applied
@@ -535,55 +630,37 @@ class TimetableConstraints:
     # AI-Generated Constraint
     def apply_lab_sessions_end_before_5pm(self, lab_variables, theory_variables):
         """Ensure all lab sessions end before 5 PM."""
-        constraints_applied = 0
-        max_slot = 16  # Assuming slots are 30 minutes each, 5 PM is slot 16 (8 AM + 9 hours)
-
-        for course_id, course_vars in lab_variables.items():
-            for day_idx in course_vars:
-                for slot_idx in course_vars[day_idx]:
-                    if slot_idx >= max_slot:
-                        for room_id, var in course_vars[day_idx][slot_idx].items():
-                            self.model.Add(var == 0)  # Block this assignment
-                            constraints_applied += 1
+        constraints_applied = self._apply_forbidden_cells(
+            lab_variables, theory_variables, ('lab_end_before_5pm',))['lab_end_before_5pm']
 
         self.logger.info(f"Applied {constraints_applied} lab_sessions_end_before_5pm constraints")
         return constraints_applied
 
+    @ai_constraint
     def apply_teacher_workload_limit(self, lab_variables, theory_variables):
         """Limit teachers to maximum 8 hours per day."""
         constraints_applied = 0
 
-        # Get all teachers
-        teachers = set()
-        for _, course in self.courses_df.iterrows():
-            teachers.add(course['teacher_id'])
-
-        # For each teacher and each day
-        for teacher_id in teachers:
-            for day_idx in range(5):  # 5 days
-                teacher_sessions = []
-
-                # Collect all sessions for this teacher on this day
-                for course_id, course_vars in lab_variables.items():
-                    course_info = self.courses_df[self.courses_df['course_id'] == course_id]
-                    if not course_info.empty and course_info.iloc[0]['teacher_id'] == teacher_id:
-                        if day_idx in course_vars:
-                            for slot_idx in course_vars[day_idx]:
-                                for room_vars in course_vars[day_idx][slot_idx].values():
-                                    teacher_sessions.append(room_vars * 2)  # Lab = 2 hours
-
-                for course_id, course_vars in theory_variables.items():
-                    course_info = self.courses_df[self.courses_df['course_id'] == course_id]
-                    if not course_info.empty and course_info.iloc[0]['teacher_id'] == teacher_id:
-                        if day_idx in course_vars:
-                            for slot_idx in course_vars[day_idx]:
-                                for room_vars in course_vars[day_idx][slot_idx].values():
-                                    teacher_sessions.append(room_vars * 1)  # Theory = 1 hour
-
-                # Constraint: max 8 hours per day per teacher
-                if teacher_sessions:
-                    self.model.Add(sum(teacher_sessions) <= 8)
-                    constraints_applied += 1
+        from ortools.sat.python import cp_model
+
+        # One pass over all sessions: (teacher_id, day_idx) -> session variables and their hours
+        teacher_day_vars = defaultdict(list)
+        teacher_day_hours = defaultdict(list)
+        for variables, hours in ((lab_variables, 2), (theory_variables, 1)):  # Lab = 2 hours, theory = 1 hour
+            for course_id, day_idx, slot_idx, room_id, var in self._flat(variables):
+                teacher_id = self._teacher_by_course.get(course_id)
+                if teacher_id is not None and day_idx < 5:  # 5 days
+                    teacher_day_vars[(teacher_id, day_idx)].append(var)
+                    teacher_day_hours[(teacher_id, day_idx)].append(hours)
+
+        # Constraint: max 8 hours per day per teacher
+        for key, session_vars in teacher_day_vars.items():
+            session_hours = teacher_day_hours[key]
+            if sum(session_hours) <= 8:
+                # Even every session at once fits in the limit, nothing to constrain
+                continue
+            self.model.Add(cp_model.LinearExpr.WeightedSum(session_vars, session_hours) <= 8)
+            constraints_applied += 1
 
         self.logger.info(f"Applied {constraints_applied} teacher workload limit constraints")
         return constraints_applied
@@ -592,15 +669,8 @@ class TimetableConstraints:
     # AI-Generated Constraint
     def apply_no_theory_during_lunch(self, lab_variables, theory_variables):
         """Block theory classes during lunch time (12:30 PM slot)."""
-        constraints_applied = 0
-        lunch_slot_index = 5  # Assuming slot 5 corresponds to 12:30 PM
-
-        for course_id, course_vars in theory_variables.items():
-            for day_idx in course_vars:
-                if lunch_slot_index in course_vars[day_idx]:
-                    for room_id, var in course_vars[day_idx][lunch_slot_index].items():
-                        self.model.Add(var == 0)  # Block theory class during lunch
-                        constraints_applied += 1
+        constraints_applied = self._apply_forbidden_cells(
+            lab_variables, theory_variables, ('no_theory_during_lunch',))['no_theory_during_lunch']
 
         self.logger.info(f"Applied {constraints_applied} no_theory_during_lunch constraints")
         return constraints_applied